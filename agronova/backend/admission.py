@@ -0,0 +1,161 @@
+"""
+Admission control: per-class concurrency budgets with bounded queueing.
+
+Each prioritized route belongs to a class. A request runs when its
+class is under its concurrency limit and the process is under
+ADMISSION_TOTAL_LIMIT; otherwise it waits. Freed slots go to the
+highest-priority waiter that fits. A request that can't get a slot within
+its class's max wait (or finds the queue full) is shed straight away:
+routes registered with on_shed() answer with a degraded response, the
+rest get 503 with Retry-After. Unlisted routes (health, metrics, admin)
+are never queued.
+
+Limits can be tuned per class with ADMISSION_<CLASS>_LIMIT, _WAIT_MS and
+_QUEUE, e.g. ADMISSION_LOW_LIMIT=8.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import time
+
+from starlette.requests import Request
+
+from fastjson import FastJSONResponse
+from metrics import ADMISSION_QUEUE_DEPTH, ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_SECONDS, ADMISSION_SHED
+
+ADMISSION_TOTAL_LIMIT = int(os.getenv("ADMISSION_TOTAL_LIMIT", "256"))
+
+
+class PriorityClass:
+    """A concurrency budget; lower priority numbers are served first"""
+
+    def __init__(self, name: str, priority: int, limit: int, max_wait_ms: float,
+                 max_queue: int, retry_after: int):
+        env = lambda setting, default: os.getenv(f"ADMISSION_{name.upper()}_{setting}", default)
+        self.name = name
+        self.priority = priority
+        self.limit = int(env("LIMIT", limit))
+        self.max_wait = float(env("WAIT_MS", max_wait_ms)) / 1000
+        self.max_queue = int(env("QUEUE", max_queue))
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.waiting = 0
+
+
+# Onboarding and the core lookups wait longest and are woken first; chat
+# holds an upstream connection for seconds, so it gets a small budget and
+# is shed (to the rule-based reply) almost as soon as it would queue.
+CRITICAL = PriorityClass("critical", 0, limit=128, max_wait_ms=2000, max_queue=256, retry_after=2)
+NORMAL = PriorityClass("normal", 1, limit=128, max_wait_ms=1000, max_queue=128, retry_after=2)
+LOW = PriorityClass("low", 2, limit=16, max_wait_ms=100, max_queue=16, retry_after=5)
+
+# path -> async (Request) -> Response or None (None falls back to 503)
+_degraded = {}
+
+
+def on_shed(path: str):
+    """Register a degraded-response handler for requests shed on `path`"""
+    def register(fn):
+        _degraded[path] = fn
+        return fn
+    return register
+
+
+class AdmissionController:
+    def __init__(self, total_limit: int = ADMISSION_TOTAL_LIMIT):
+        self.total_limit = total_limit
+        self.in_flight = 0
+        self._waiters = []  # heap of (priority, seq, class, future)
+        self._seq = itertools.count()
+
+    def _has_room(self, cls: PriorityClass) -> bool:
+        return self.in_flight < self.total_limit and cls.in_flight < cls.limit
+
+    def _grant(self, cls: PriorityClass):
+        self.in_flight += 1
+        cls.in_flight += 1
+        ADMISSION_IN_FLIGHT.inc(cls.name)
+
+    async def acquire(self, cls: PriorityClass) -> bool:
+        """Wait for a slot; False if the request should be shed"""
+        if self._has_room(cls):
+            self._grant(cls)
+            return True
+        if cls.waiting >= cls.max_queue or cls.max_wait <= 0:
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (cls.priority, next(self._seq), cls, future))
+        cls.waiting += 1
+        ADMISSION_QUEUE_DEPTH.inc(cls.name)
+        try:
+            await asyncio.wait_for(future, cls.max_wait)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except BaseException:
+            # Cancelled (client went away) after a slot was handed over
+            if future.done() and not future.cancelled():
+                self.release(cls)
+            raise
+        finally:
+            cls.waiting -= 1
+            ADMISSION_QUEUE_DEPTH.dec(cls.name)
+
+    def release(self, cls: PriorityClass):
+        self.in_flight -= 1
+        cls.in_flight -= 1
+        ADMISSION_IN_FLIGHT.dec(cls.name)
+        self._wake()
+
+    def _wake(self):
+        """Hand free slots to the highest-priority waiters whose class has room"""
+        blocked = []
+        while self._waiters and self.in_flight < self.total_limit:
+            entry = heapq.heappop(self._waiters)
+            cls, future = entry[2], entry[3]
+            if future.done():  # timed out or cancelled
+                continue
+            if cls.in_flight >= cls.limit:
+                blocked.append(entry)
+                continue
+            self._grant(cls)
+            future.set_result(None)
+        for entry in blocked:
+            heapq.heappush(self._waiters, entry)
+
+
+def busy_response(cls: PriorityClass) -> FastJSONResponse:
+    return FastJSONResponse({"detail": "Server busy, please retry shortly"}, status_code=503,
+                            headers={"Retry-After": str(cls.retry_after)})
+
+
+class AdmissionMiddleware:
+    """Applies admission control to the routes mapped to a priority class"""
+
+    def __init__(self, app, routes: dict, controller: AdmissionController = None):
+        self.app = app
+        self.routes = routes
+        self.controller = controller or AdmissionController()
+
+    async def __call__(self, scope, receive, send):
+        cls = self.routes.get(scope["path"]) if scope["type"] == "http" else None
+        if cls is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        admitted = await self.controller.acquire(cls)
+        ADMISSION_QUEUE_SECONDS.observe(time.perf_counter() - start, cls.name)
+        if not admitted:
+            handler = _degraded.get(scope["path"])
+            response = await handler(Request(scope, receive)) if handler else None
+            ADMISSION_SHED.inc(cls.name, "rejected" if response is None else "degraded")
+            await (response or busy_response(cls))(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(cls)
@@ -0,0 +1,126 @@
+"""
+Startup cost of the crop catalogue: the old Python-literal CROP_DB versus
+the compiled, memory-mapped artifact, at a synthetic catalogue size.
+
+    python bench/catalogue_bench.py --crops 500
+    python bench/catalogue_bench.py --crops 500 --languages 12
+
+Each variant is loaded in fresh interpreters (the literal module from a
+warm .pyc, as after `compileall`); reports the median load time, the RSS
+growth and the Python heap allocated by the load. `languages_used` is the
+artifact's heap after serving guidance in 1, 2 and all languages (languages
+beyond the real ones are synthetic copies of the English text).
+"""
+import argparse
+import json
+import os
+import py_compile
+import statistics
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalogue import compile_catalogue, read_sources
+from crop_bench import synthetic_crops
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child: setup, then time one load and print seconds, RSS growth
+# (KiB) and Python heap allocated (KiB)
+PROBE = """
+import sys, time, tracemalloc
+sys.path[:0] = [{workdir!r}, {backend!r}]
+def rss():
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmRSS"))
+{setup}
+if {traced}:
+    tracemalloc.start()
+before = rss()
+start = time.perf_counter()
+{load}
+elapsed = time.perf_counter() - start
+heap = tracemalloc.get_traced_memory()[0] // 1024 if {traced} else 0
+print(elapsed, rss() - before, heap)
+"""
+
+# name -> (setup, timed load); the artifact load includes decoding English text
+LOADERS = {
+    "python_literal": ("", "import legacy_catalogue; db = legacy_catalogue.CROP_DB"),
+    "compiled_artifact": ("from catalogue import open_catalogue",
+                          "db = open_catalogue({artifact!r}); db.info(0, 'english')"),
+}
+
+
+def distinct_text(crops: list) -> list:
+    """Make every guidance string unique per crop, as in a real catalogue"""
+    def mark(value, i):
+        if isinstance(value, str):
+            return f"{value} ({i})"
+        if isinstance(value, list):
+            return [mark(v, i) for v in value]
+        return {k: mark(v, i) for k, v in value.items()}
+    return [{**crop, "info": mark(crop["info"], i)} for i, crop in enumerate(crops)]
+
+
+def add_languages(crops: list, languages: list, total: int) -> list:
+    """Pad the catalogue to `total` languages with distinct copies of the English text"""
+    extra = [f"lang{n}" for n in range(len(languages) + 1, total + 1)]
+    for crop in crops:
+        english = json.dumps(crop["info"]["english"], ensure_ascii=False)
+        for lang in extra:
+            crop["names"][lang] = f'{crop["names"]["english"]} [{lang}]'
+            crop["info"][lang] = json.loads(english.replace('",', f' [{lang}]",'))
+    return languages + extra
+
+
+def probe(setup: str, load: str, workdir: str, traced: bool) -> tuple:
+    code = PROBE.format(workdir=workdir, backend=BACKEND_DIR, traced=traced, setup=setup, load=load)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    elapsed, rss_kb, heap_kb = out.stdout.split()
+    return float(elapsed), int(rss_kb), int(heap_kb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="crop catalogue load time and memory")
+    parser.add_argument("--crops", type=int, default=500)
+    parser.add_argument("--languages", type=int, default=0, help="pad the catalogue to this many languages")
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    languages = read_sources()[0]
+    crops = distinct_text(synthetic_crops(args.crops))
+    languages = add_languages(crops, languages, args.languages)
+    with tempfile.TemporaryDirectory() as workdir:
+        literal = os.path.join(workdir, "legacy_catalogue.py")
+        with open(literal, "w", encoding="utf-8") as f:
+            f.write("CROP_DB = " + repr({c["key"]: c for c in crops}) + "\n")
+        artifact = os.path.join(workdir, "catalogue.bin")
+        with open(artifact, "wb") as f:
+            f.write(compile_catalogue(crops, languages))
+
+        py_compile.compile(literal)  # import from a warm .pyc, as in a deploy
+        results = {"crops": args.crops, "python_literal_bytes": os.path.getsize(literal),
+                   "artifact_bytes": os.path.getsize(artifact)}
+        for name, (setup, load) in LOADERS.items():
+            load = load.format(artifact=artifact)
+            runs = [probe(setup, load, workdir, False) for _ in range(args.runs)]
+            results[name] = {
+                "load_ms": round(statistics.median(r[0] for r in runs) * 1000, 2),
+                "rss_kb": statistics.median(r[1] for r in runs),
+                "heap_kb": probe(setup, load, workdir, True)[2],
+            }
+
+        setup = f"from catalogue import open_catalogue; db = open_catalogue({artifact!r})"
+        results["languages_used"] = {
+            used: {"heap_kb": probe(setup, f"for lang in db.languages[:{used}]: db.info(0, lang)", workdir, True)[2]}
+            for used in sorted({1, 2, len(languages)})
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
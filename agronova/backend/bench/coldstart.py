@@ -0,0 +1,85 @@
+"""
+Cold-start timer: spawns `uvicorn main:app` and measures wall time from
+process spawn to the first byte of /api/health, and to /api/ready == 200.
+
+Usage (from agronova/backend):
+    python bench/coldstart.py --runs 5 [--app-dir PATH]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def poll(url: str, deadline: float, want_ok: bool = False):
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resp:
+                return resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            if not want_ok or e.code == 404:
+                return e.code, e.read()
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.002)
+    raise SystemExit(f"Timed out waiting for {url}")
+
+
+def one_run(app_dir: str) -> dict:
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    workdir = tempfile.mkdtemp(prefix="agronova-cold-")
+    env = {**os.environ, "AGRONOVA_DB_PATH": os.path.join(workdir, "agronova.db")}
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning",
+         "--app-dir", app_dir],
+        cwd=workdir, env=env, stdout=subprocess.DEVNULL)
+    try:
+        deadline = start + 30
+        poll(f"{base}/api/health", deadline)
+        first_byte = time.perf_counter() - start
+        result = {"first_byte_ms": round(first_byte * 1000, 1)}
+        status, body = poll(f"{base}/api/ready", deadline, want_ok=True)
+        if status == 200:  # older builds have no readiness endpoint
+            result["ready_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            result["startup"] = json.loads(body)
+        return result
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgroNova cold-start timer")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--app-dir", default=BACKEND_DIR)
+    args = parser.parse_args()
+
+    runs = [one_run(args.app_dir) for _ in range(args.runs)]
+    summary = {"runs": args.runs,
+               "first_byte_ms_median": statistics.median(r["first_byte_ms"] for r in runs)}
+    if all("ready_ms" in r for r in runs):
+        summary["ready_ms_median"] = statistics.median(r["ready_ms"] for r in runs)
+        summary["last_startup"] = runs[-1]["startup"]
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
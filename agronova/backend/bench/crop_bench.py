@@ -0,0 +1,220 @@
+"""
+Microbenchmarks for crop_engine hot paths with a regression gate.
+
+    python bench/crop_bench.py run                          # print results
+    python bench/crop_bench.py run --save                   # write baseline
+    python bench/crop_bench.py compare --threshold 0.20     # exit 1 on regression
+
+Benchmarks run over synthetic catalogues of 5, 500 and 5,000 crops built from
+the real catalogue entries with randomized (seeded) growing conditions, and over
+randomized field conditions. Each result is the best per-call time over
+several repeats, which is the most stable statistic on shared machines.
+
+Baselines are machine-specific: regenerate with `run --save` on the machine
+(or CI runner class) that runs `compare`.
+"""
+import argparse
+import contextlib
+import copy
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import crop_engine
+from portfolio import optimize_portfolio
+from catalogue import Catalogue, compile_catalogue, read_sources
+from crop_engine import SOIL_MAP, WATER_MAP, score_crop, recommend_crops, get_crop_guidance, \
+    grid_axis, suitability_grid
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "crop_engine.json")
+CATALOGUE_SIZES = (5, 500, 5000)
+SOILS = ["loamy", "clay", "sandy", "silty"]
+WATER = ["high", "medium", "low", "none"]
+LANGUAGES = ["english", "hindi", "marathi"]
+
+
+def synthetic_crops(size: int, seed: int = 42) -> list:
+    """`size` crop definitions cloned from the catalogue data with randomized conditions"""
+    rng = random.Random(seed)
+    templates = read_sources()[1]
+    crops = []
+    for i in range(size):
+        crop = copy.deepcopy(templates[i % len(templates)])
+        key = crop["key"] if i < len(templates) else f'{crop["key"]}_{i}'
+        temp_min = rng.randint(5, 25)
+        rain_min = rng.randint(200, 1500)
+        crop["key"] = key
+        crop["conditions"] = {
+            "soils": rng.sample(SOILS, rng.randint(1, 3)),
+            "ph_min": 5.5, "ph_max": 7.5,
+            "temp_min": temp_min, "temp_max": temp_min + rng.randint(8, 15),
+            "rain_min": rain_min, "rain_max": rain_min + rng.randint(300, 2000),
+            "water": rng.sample(WATER[:3], rng.randint(1, 3)),
+        }
+        crops.append(crop)
+    return crops
+
+
+def synthetic_catalogue(size: int, seed: int = 42) -> Catalogue:
+    return Catalogue(compile_catalogue(synthetic_crops(size, seed), read_sources()[0]))
+
+
+def field_conditions(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    soils = list(SOIL_MAP)
+    water = list(WATER_MAP)
+    return [(rng.choice(soils), rng.uniform(5, 40), rng.uniform(100, 3000),
+             rng.uniform(20, 95), rng.choice(water), rng.choice(LANGUAGES)) for _ in range(n)]
+
+
+@contextlib.contextmanager
+def use_catalogue(catalogue: Catalogue, cache_size: int = 0):
+    """Swap the catalogue in; the recommendation cache is off unless cache_size is given"""
+    original, original_size = crop_engine.CATALOGUE, crop_engine.RECOMMEND_CACHE_SIZE
+    crop_engine.set_catalogue(catalogue)
+    crop_engine.RECOMMEND_CACHE_SIZE = cache_size
+    try:
+        yield
+    finally:
+        crop_engine.set_catalogue(original)
+        crop_engine.RECOMMEND_CACHE_SIZE = original_size
+
+
+MIN_REPEAT_SECONDS = 0.05
+
+
+def best_per_call_us(fn, calls: int, repeat: int) -> float:
+    """
+    fn performs `calls` operations. Each repeat loops fn for at least
+    MIN_REPEAT_SECONDS; returns the best microseconds per operation.
+    """
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    number = max(number, int(number * MIN_REPEAT_SECONDS / elapsed) if elapsed else number)
+    return min(timer.repeat(number=number, repeat=repeat)) / (number * calls) * 1e6
+
+
+def run_benchmarks(repeat: int = 7) -> dict:
+    conditions = field_conditions(1000)
+    results = {}
+
+    # Input normalization (multilingual soil/water names)
+    raw_inputs = [(c[0].upper() if i % 3 == 0 else c[0], c[4]) for i, c in enumerate(conditions)]
+    results["normalize_inputs"] = best_per_call_us(
+        lambda: [(crop_engine.normalize_soil(s), crop_engine.normalize_water(w)) for s, w in raw_inputs],
+        len(raw_inputs), repeat)
+
+    # Single-crop scoring
+    catalogue = synthetic_catalogue(500)
+    pairs = [(i % len(catalogue), c) for i, c in enumerate(conditions)]
+    results["score_crop"] = best_per_call_us(
+        lambda: [score_crop(catalogue, i, "loamy", c[1], c[2], "medium") for i, c in pairs],
+        len(pairs), repeat)
+
+    # Full recommendation (cache disabled) over each catalogue size
+    for size in CATALOGUE_SIZES:
+        catalogue = synthetic_catalogue(size)
+        calls = conditions[:max(5, 20000 // size)]
+        with use_catalogue(catalogue):
+            results[f"recommend_crops[{size}]"] = best_per_call_us(
+                lambda: [recommend_crops(*c) for c in calls], len(calls), repeat)
+
+    # Recommendation cache hits: 1,000 requests over 50 distinct field conditions
+    hot = [conditions[i % 50] for i in range(1000)]
+    with use_catalogue(synthetic_catalogue(500), cache_size=4096):
+        results["recommend_crops_cached"] = best_per_call_us(
+            lambda: [recommend_crops(*c) for c in hot], len(hot), repeat)
+
+    # Guidance building (text lookup + calculator) for every crop/language
+    rng = random.Random(3)
+    guidance_calls = [(key, rng.choice(LANGUAGES), rng.choice([0.5, 1, 2, 5, 12.5]))
+                      for key in crop_engine.CATALOGUE.keys for _ in range(40)]
+    results["get_crop_guidance"] = best_per_call_us(
+        lambda: [get_crop_guidance(*g) for g in guidance_calls], len(guidance_calls), repeat)
+
+    # What-if sweep: every crop of 500 over a 200 x 200 temperature/rainfall grid
+    catalogue = synthetic_catalogue(500)
+    temperatures, rainfalls = grid_axis(0, 45, 200), grid_axis(0, 3000, 200)
+    results["suitability_grid[500x200x200]"] = best_per_call_us(
+        lambda: suitability_grid(catalogue.keys, "loamy", "medium", temperatures, rainfalls, catalogue),
+        1, repeat)
+
+    # Portfolio what-ifs: the same 500 crops under varying area, budget and water
+    plans = [(rng.uniform(2, 20), rng.uniform(50000, 600000), c[0], c[1], c[2], c[4],
+              rng.choice([None, rng.uniform(0, 80000)]), rng.choice([1.0, 0.5])) for c in conditions[:100]]
+    results["optimize_portfolio[500]"] = best_per_call_us(
+        lambda: [optimize_portfolio(*p, catalogue=catalogue) for p in plans], len(plans), repeat)
+
+    return {name: round(us, 3) for name, us in results.items()}
+
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "machine": platform.machine(),
+            "processor": platform.processor() or platform.platform()}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Rows of (name, baseline_us, current_us, ratio, regressed). A benchmark
+    missing from either side counts as regressed (ratio None), so a new or
+    renamed one fails until the baseline is re-saved.
+    """
+    rows = []
+    for name in list(baseline["results"]) + [n for n in current if n not in baseline["results"]]:
+        base, now = baseline["results"].get(name), current.get(name)
+        if base is None or now is None:
+            rows.append((name, base, now, None, True))
+            continue
+        ratio = now / base if base else float("inf")
+        rows.append((name, base, now, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="crop_engine microbenchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_p = sub.add_parser("run", help="run benchmarks and print JSON")
+    run_p.add_argument("--save", action="store_true", help="write results as the baseline")
+    run_p.add_argument("--baseline", default=BASELINE_PATH)
+    run_p.add_argument("--repeat", type=int, default=7)
+    cmp_p = sub.add_parser("compare", help="run and fail if slower than the baseline")
+    cmp_p.add_argument("--baseline", default=BASELINE_PATH)
+    cmp_p.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown, 0.20 = 20%%")
+    cmp_p.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.repeat)
+
+    if args.command == "run":
+        report = {"environment": environment(), "unit": "us_per_call", "results": results}
+        print(json.dumps(report, indent=2))
+        if args.save:
+            os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+            with open(args.baseline, "w") as f:
+                f.write(json.dumps(report, indent=2) + "\n")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, args.threshold)
+    print(json.dumps({
+        "threshold": args.threshold,
+        "benchmarks": [{"name": n, "baseline_us": b, "current_us": c,
+                        "ratio": None if r is None else round(r, 3), "regressed": bad}
+                       for n, b, c, r, bad in rows],
+    }, indent=2))
+    for name, base, now, *_ in rows:
+        if base is None or now is None:
+            print(f"❌ {name}: {'not in the baseline' if base is None else 'no longer measured'}"
+                  " — re-save the baseline with `run --save`", file=sys.stderr)
+    if any(bad for *_, bad in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
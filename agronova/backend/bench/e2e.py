@@ -0,0 +1,114 @@
+"""
+End-to-end load test: boots the stub upstreams and main:app under uvicorn,
+drives a realistic traffic mix, and writes machine-readable results.
+
+Usage (from agronova/backend):
+    python bench/e2e.py --duration 30 --concurrency 64 --output results.json
+    python bench/e2e.py --stub-env STUB_CHAT_LATENCY_MS=2000 --stub-env STUB_WEATHER_ERROR_RATE=0.05
+
+Exit status is 1 if the overall error rate exceeds --max-error-rate.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from loadtest import run_mix, parse_mix
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MIX = "weather=4,recommend=4,guidance=3,translations=2,onboard=2,chat=1"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app: str, port: int, env: dict, workers: int = 1) -> subprocess.Popen:
+    env = dict(env)
+    cwd = env.pop("_CWD", BACKEND_DIR)
+    cmd = [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port),
+           "--log-level", "warning", "--app-dir", BACKEND_DIR]
+    if workers > 1:
+        cmd += ["--workers", str(workers)]
+    return subprocess.Popen(cmd, env={**os.environ, **env}, cwd=cwd)
+
+
+def wait_ready(url: str, timeout: float = 20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise SystemExit(f"Server at {url} did not become ready")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgroNova end-to-end load test")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for main:app")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--stub-env", action="append", default=[], metavar="NAME=VALUE",
+                        help="stub setting, e.g. STUB_CHAT_LATENCY_MS=1500 (repeatable)")
+    parser.add_argument("--app-env", action="append", default=[], metavar="NAME=VALUE",
+                        help="extra environment for main:app (repeatable)")
+    parser.add_argument("--output", help="also write the JSON result to this file")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    stub_port, app_port = free_port(), free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+    workdir = tempfile.mkdtemp(prefix="agronova-e2e-")
+
+    stub_env = dict(kv.split("=", 1) for kv in args.stub_env)
+    app_env = {
+        "OPENWEATHER_API_KEY": "stub",
+        "OPENWEATHER_BASE_URL": stub_url,
+        "ANTHROPIC_API_KEY": "stub",
+        "ANTHROPIC_BASE_URL": stub_url,
+        "AGRONOVA_DB_PATH": os.path.join(workdir, "agronova.db"),
+        "_CWD": workdir,
+        **dict(kv.split("=", 1) for kv in args.app_env),
+    }
+
+    procs = [start_server("bench.stubs:app", stub_port, stub_env)]
+    try:
+        wait_ready(f"{stub_url}/data/2.5/weather?q=pune")
+        procs.append(start_server("main:app", app_port, app_env, args.workers))
+        wait_ready(f"{app_url}/api/health")
+
+        result = asyncio.run(run_mix(app_url, parse_mix(args.mix), args.concurrency, args.duration))
+        result["config"] = {"mix": args.mix, "workers": args.workers,
+                            "stub_env": stub_env, "app_env": dict(kv.split("=", 1) for kv in args.app_env)}
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.wait(timeout=10)
+
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+    if result["overall"]["error_rate"] > args.max_error_rate:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+HTTP load generator for the AgroNova API.
+
+Usage:
+    python bench/loadtest.py --url http://127.0.0.1:8000 --concurrency 32 --duration 10
+    python bench/loadtest.py --mix weather=3,recommend=3,guidance=2,chat=1
+
+Without --mix each endpoint is driven on its own, one after another; with
+--mix the weighted endpoints are interleaved in a single run. Prints
+throughput, latency percentiles and error rates as JSON.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+LANGUAGES = ["english", "hindi", "marathi"]
+CITIES = ["Pune", "Nashik", "Nagpur", "Latur", "Jaipur", "Patna", "Indore", "Kolhapur", "Surat", "Bhopal"]
+SOILS = ["loamy", "black", "clay", "sandy", "red", "दोमट", "काळी माती", "alluvial"]
+WATER = ["high", "medium", "low", "rainfed", "मध्यम", "कमी"]
+CROPS = ["wheat", "rice", "maize", "soybean", "cotton"]
+QUESTIONS = ["When should I apply urea?", "How often to irrigate?", "Neem spray for pests?",
+             "Best mandi price for cotton?", "मिट्टी कैसे सुधारें?"]
+
+
+def _location() -> str:
+    # Mostly well-known towns (cache hits), a long tail of villages (misses)
+    if random.random() < 0.7:
+        return random.choice(CITIES)
+    return f"Village {random.randint(1, 5000)}"
+
+
+# Town centres (lat, lon); GPS fixes land within ~20 km of one
+TOWN_COORDS = [(18.52, 73.86), (20.00, 73.79), (21.15, 79.09), (18.41, 76.56), (16.70, 74.24)]
+
+
+def _gps_fix() -> dict:
+    lat, lon = random.choice(TOWN_COORDS)
+    return {"lat": round(lat + random.uniform(-0.2, 0.2), 5), "lon": round(lon + random.uniform(-0.2, 0.2), 5)}
+
+
+# name -> () -> (method, path, body)
+SCENARIOS = {
+    "translations": lambda: ("GET", f"/api/translations/{random.choice(LANGUAGES)}", None),
+    "weather": lambda: ("POST", "/api/weather", {"location": _location(), "language": random.choice(LANGUAGES)}),
+    "weather_gps": lambda: ("POST", "/api/weather/by-coords", {**_gps_fix(), "language": random.choice(LANGUAGES)}),
+    "weather_hot": lambda: ("POST", "/api/weather", {"location": random.choice(CITIES), "language": "english"}),
+    "recommend": lambda: ("POST", "/api/recommend-crops", {
+        "location": random.choice(CITIES), "temperature": random.choice([22, 24, 26, 28, 30]),
+        "rainfall": random.choice([550, 700, 900, 1100, 1400]), "humidity": random.randint(40, 80),
+        "soil_type": random.choice(SOILS), "water_level": random.choice(WATER),
+        "language": random.choice(LANGUAGES),
+    }),
+    "guidance": lambda: ("POST", "/api/crop-guidance", {
+        "crop_key": random.choice(CROPS), "language": random.choice(LANGUAGES),
+        "area_hectares": random.choice([1, 1, 1, 2, 2.5, 5]),
+    }),
+    "onboard": lambda: ("POST", "/api/onboard", {
+        "location": _location(), "soil_type": random.choice(SOILS),
+        "water_level": random.choice(WATER), "language": random.choice(LANGUAGES),
+    }),
+    "chat": lambda: ("POST", "/api/chat", {
+        "message": random.choice(QUESTIONS), "language": random.choice(LANGUAGES),
+        "context": {"crop": random.choice(CROPS)},
+    }),
+    "health": lambda: ("GET", "/api/health", None),
+}
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def summarize(name: str, latencies: list, statuses: dict, elapsed: float) -> dict:
+    total = len(latencies)
+    errors = sum(n for code, n in statuses.items() if code == "error" or code >= 500)
+    return {
+        "endpoint": name,
+        "requests": total,
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "statuses": {str(k): v for k, v in sorted(statuses.items(), key=lambda kv: str(kv[0]))},
+    }
+
+
+async def run_mix(url: str, mix: dict, concurrency: int, duration: float, timeout: float = 30) -> dict:
+    """Drive a weighted mix of scenarios; returns per-endpoint and overall stats"""
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    latencies = {n: [] for n in names}
+    statuses = {n: {} for n in names}
+    deadline = time.perf_counter() + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        async def worker():
+            while time.perf_counter() < deadline:
+                name = random.choices(names, weights)[0]
+                method, path, body = SCENARIOS[name]()
+                start = time.perf_counter()
+                try:
+                    resp = await client.request(method, path, json=body)
+                    status = resp.status_code
+                except httpx.HTTPError:
+                    status = "error"
+                latencies[name].append(time.perf_counter() - start)
+                statuses[name][status] = statuses[name].get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [v for n in names for v in latencies[n]]
+    all_statuses = {}
+    for n in names:
+        for code, count in statuses[n].items():
+            all_statuses[code] = all_statuses.get(code, 0) + count
+
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "overall": summarize("overall", all_latencies, all_statuses, elapsed),
+        "endpoints": [summarize(n, latencies[n], statuses[n], elapsed) for n in names],
+    }
+
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="AgroNova load test")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--endpoints", default="translations,weather,recommend,guidance,health",
+                        help="endpoints to drive one at a time")
+    parser.add_argument("--mix", help="weighted mix run instead, e.g. weather=3,recommend=3,chat=1")
+    args = parser.parse_args()
+
+    if args.mix:
+        result = await run_mix(args.url, parse_mix(args.mix), args.concurrency, args.duration)
+    else:
+        result = [(await run_mix(args.url, {name: 1}, args.concurrency, args.duration))["endpoints"][0]
+                  for name in args.endpoints.split(",")]
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
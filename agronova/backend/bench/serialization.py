@@ -0,0 +1,85 @@
+"""
+Per-endpoint JSON microbenchmarks: FastAPI's default path (jsonable_encoder
++ stdlib json) versus fastjson (orjson), for both response serialization and
+request validation. Also checks the two paths produce identical bytes.
+
+Usage:
+    python bench/serialization.py [--number 2000]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+
+import fastjson
+from crop_engine import recommend_crops, get_crop_guidance
+from main import TRANSLATIONS, WeatherRequest, CropRequest, CropSelectRequest, ChatRequest
+from weather import get_demo_weather
+
+
+def stdlib_render(content) -> bytes:
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+RESPONSES = {
+    "translations": {"language": "hindi", "translations": TRANSLATIONS["hindi"]},
+    "weather": get_demo_weather("Pune"),
+    "recommend-crops": {"session_id": 1, "crops": recommend_crops("loamy", 26, 750, 60, "medium", "marathi")},
+    "crop-guidance": get_crop_guidance("cotton", "hindi", 2.5),
+    "chat": {"reply": "अधिकांश फसलों के लिए NPK खाद का उपयोग करें।"},
+}
+
+REQUESTS = {
+    "weather": (WeatherRequest, {"location": "Pune", "language": "hindi"}),
+    "recommend-crops": (CropRequest, {"location": "Pune", "temperature": 26.5, "rainfall": 750,
+                                      "humidity": 60, "soil_type": "दोमट", "water_level": "मध्यम",
+                                      "language": "hindi"}),
+    "crop-guidance": (CropSelectRequest, {"crop_key": "wheat", "language": "marathi", "area_hectares": 2}),
+    "chat": (ChatRequest, {"message": "urea kab dalna hai?", "language": "hindi",
+                           "context": {"crop": "wheat", "soil": "loamy"},
+                           "history": [{"role": "user", "content": "hi"},
+                                       {"role": "assistant", "content": "Namaste"}] * 3}),
+}
+
+
+def usec(fn, number: int) -> float:
+    return round(min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgroNova JSON microbenchmarks")
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = {"fast_json": fastjson.FAST_JSON, "serialize": [], "validate": []}
+
+    for name, content in RESPONSES.items():
+        baseline = stdlib_render(content)
+        fast = fastjson.dumps(content)
+        results["serialize"].append({
+            "endpoint": name,
+            "bytes": len(baseline),
+            "identical": baseline == fast,
+            "stdlib_us": usec(lambda: stdlib_render(content), args.number),
+            "fast_us": usec(lambda: fastjson.dumps(content), args.number),
+        })
+
+    for name, (model, payload) in REQUESTS.items():
+        raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        results["validate"].append({
+            "endpoint": name,
+            "stdlib_us": usec(lambda: model.model_validate(json.loads(raw)), args.number),
+            "fast_us": usec(lambda: model.model_validate_json(raw), args.number),
+        })
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Stub upstreams for load testing: OpenWeatherMap (/data/2.5/weather) and the
+Anthropic messages API (/v1/messages), served from one ASGI app. Weather
+answers both ?q=<place> and ?lat=&lon= lookups.
+
+Each stub's behaviour is set through the environment (per upstream prefix
+STUB_WEATHER_ / STUB_CHAT_):
+    ..._LATENCY_MS      mean added latency (default 80 / 600)
+    ..._JITTER_MS       uniform +/- jitter (default 20 / 200)
+    ..._ERROR_RATE      fraction answered with HTTP 500 (default 0)
+    ..._TIMEOUT_RATE    fraction that hang for 30 s (default 0)
+    STUB_WEATHER_NOT_FOUND_RATE  fraction of lookups answered 404 (default 0.02)
+
+Run standalone:
+    uvicorn bench.stubs:app --port 9100
+"""
+import asyncio
+import hashlib
+import os
+import random
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+class StubConfig:
+    def __init__(self, prefix: str, latency_ms: float, jitter_ms: float):
+        env = lambda name, default: float(os.getenv(f"STUB_{prefix}_{name}", default))
+        self.latency = env("LATENCY_MS", latency_ms) / 1000
+        self.jitter = env("JITTER_MS", jitter_ms) / 1000
+        self.error_rate = env("ERROR_RATE", 0)
+        self.timeout_rate = env("TIMEOUT_RATE", 0)
+        self.not_found_rate = env("NOT_FOUND_RATE", 0.02)
+
+    async def delay(self) -> bool:
+        """Sleep for the configured latency; False if this call should fail"""
+        roll = random.random()
+        if roll < self.timeout_rate:
+            await asyncio.sleep(30)
+            return False
+        await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        return roll >= self.timeout_rate + self.error_rate
+
+
+WEATHER = StubConfig("WEATHER", 80, 20)
+CHAT = StubConfig("CHAT", 600, 200)
+
+
+async def weather(request: Request):
+    if not await WEATHER.delay():
+        return JSONResponse({"cod": 500, "message": "stub error"}, status_code=500)
+
+    q = request.query_params.get("q", "")
+    by_coords = "lat" in request.query_params
+    if random.random() < WEATHER.not_found_rate and not by_coords:
+        return JSONResponse({"cod": "404", "message": "city not found"}, status_code=404)
+
+    if by_coords:
+        # Point lookups echo the coordinates and name a nearby "station"
+        lat = float(request.query_params["lat"])
+        lon = float(request.query_params["lon"])
+        q = f"Station {lat:.1f} {lon:.1f}"
+        h = int(hashlib.md5(q.encode()).hexdigest(), 16)
+    else:
+        # Deterministic per place name, spread across India's bounding box
+        h = int(hashlib.md5(q.split(",")[0].lower().encode()).hexdigest(), 16)
+        lat = 8 + (h % 2800) / 100
+        lon = 68 + (h // 2800 % 2900) / 100
+    return JSONResponse({
+        "coord": {"lat": lat, "lon": lon},
+        "weather": [{"description": "scattered clouds"}],
+        "main": {"temp": 18 + (h % 170) / 10, "humidity": 40 + h % 50},
+        "rain": {"1h": (h % 30) / 10},
+        "sys": {"country": "IN"},
+        "name": q.split(",")[0].title(),
+    })
+
+
+async def messages(request: Request):
+    if not await CHAT.delay():
+        return JSONResponse({"type": "error", "error": {"type": "api_error"}}, status_code=500)
+    body = await request.json()
+    question = body["messages"][-1]["content"]
+    return JSONResponse({
+        "type": "message",
+        "role": "assistant",
+        "content": [{"type": "text", "text": f"Stub advice for: {question[:80]}"}],
+    })
+
+
+app = Starlette(routes=[
+    Route("/data/2.5/weather", weather),
+    Route("/v1/messages", messages, methods=["POST"]),
+])
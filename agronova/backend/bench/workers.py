@@ -0,0 +1,142 @@
+"""
+Worker scaling report: memory per worker and throughput as workers grow.
+
+Usage (from agronova/backend):
+    python bench/workers.py --workers 1,2,4 --duration 15
+    python bench/workers.py --server uvicorn      # naive `uvicorn --workers N` for comparison
+
+For each worker count the server is started against the stub upstreams,
+driven with the e2e traffic mix, and then every worker's memory is read
+from /proc/<pid>/smaps_rollup (Linux only):
+
+    rss_mb     resident pages, shared ones counted in full
+    pss_mb     resident pages with shared ones split between the sharers
+    shared_mb  pages also mapped by another process (the pre-fork win)
+
+total_pss_mb is the real memory cost of the whole server.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from e2e import BACKEND_DIR, DEFAULT_MIX, free_port, start_server, wait_ready
+from loadtest import run_mix, parse_mix
+
+
+def children(ppid: int) -> list:
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # pid (comm) state ppid ...; comm may contain spaces
+                if int(f.read().rsplit(")", 1)[1].split()[1]) == ppid:
+                    pids.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return sorted(pids)
+
+
+def memory(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                fields[name] = int(rest.split()[0])
+    shared = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    return {"pid": pid, "rss_mb": round(fields["Rss"] / 1024, 1),
+            "pss_mb": round(fields["Pss"] / 1024, 1), "shared_mb": round(shared / 1024, 1)}
+
+
+def start_app(server: str, workers: int, port: int, env: dict) -> subprocess.Popen:
+    if server == "uvicorn":
+        return start_server("main:app", port, env, workers)
+    env = dict(env)
+    cwd = env.pop("_CWD", BACKEND_DIR)
+    return subprocess.Popen(
+        [sys.executable, os.path.join(BACKEND_DIR, "serve.py"), "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env={**os.environ, **env}, cwd=cwd)
+
+
+def worker_pids(proc: subprocess.Popen, server: str, workers: int) -> list:
+    if server == "uvicorn" and workers == 1:
+        return [proc.pid]  # single uvicorn process serves in-process, no supervisor
+    # uvicorn --workers forks via multiprocessing, which also starts a resource tracker
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        pids = [p for p in children(proc.pid) if server == "serve" or _is_uvicorn_worker(p)]
+        if len(pids) >= workers:
+            return pids
+        time.sleep(0.1)
+    raise SystemExit(f"Expected {workers} workers under pid {proc.pid}")
+
+
+def _is_uvicorn_worker(pid: int) -> bool:
+    with open(f"/proc/{pid}/cmdline", "rb") as f:
+        return b"resource_tracker" not in f.read()
+
+
+def measure(server: str, workers: int, args, stub_url: str) -> dict:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    workdir = tempfile.mkdtemp(prefix="agronova-workers-")
+    env = {
+        "OPENWEATHER_API_KEY": "stub", "OPENWEATHER_BASE_URL": stub_url,
+        "ANTHROPIC_API_KEY": "stub", "ANTHROPIC_BASE_URL": stub_url,
+        "AGRONOVA_DB_PATH": os.path.join(workdir, "agronova.db"), "_CWD": workdir,
+    }
+    proc = start_app(server, workers, port, env)
+    try:
+        wait_ready(f"{url}/api/ready")
+        result = asyncio.run(run_mix(url, parse_mix(args.mix), args.concurrency, args.duration))
+        pids = worker_pids(proc, server, workers)
+        per_worker = [memory(pid) for pid in pids]
+        parent = memory(proc.pid) if proc.pid not in pids else None
+    finally:
+        proc.terminate()
+        proc.wait(timeout=15)
+    return {
+        "server": server,
+        "workers": workers,
+        "rps": result["overall"]["rps"],
+        "p50_ms": result["overall"]["p50_ms"],
+        "p99_ms": result["overall"]["p99_ms"],
+        "error_rate": result["overall"]["error_rate"],
+        "parent": parent,
+        "per_worker": per_worker,
+        "total_pss_mb": round((parent or {}).get("pss_mb", 0) + sum(w["pss_mb"] for w in per_worker), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgroNova worker scaling report")
+    parser.add_argument("--server", choices=["serve", "uvicorn"], default="serve")
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    args = parser.parse_args()
+
+    stub_port = free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    stubs = start_server("bench.stubs:app", stub_port, {})
+    try:
+        wait_ready(f"{stub_url}/data/2.5/weather?q=pune")
+        rows = [measure(args.server, int(n), args, stub_url) for n in args.workers.split(",")]
+    finally:
+        stubs.terminate()
+        stubs.wait(timeout=10)
+    print(json.dumps({"cpus": len(os.sched_getaffinity(0)), "mix": args.mix, "runs": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
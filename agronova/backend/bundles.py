@@ -0,0 +1,38 @@
+import hashlib
+
+from compression import Precompressed
+from fastjson import dumps
+
+# Versioned bundles never change for a given URL, so browsers and CDNs may
+# keep them for a year; the manifest is revalidated on every load instead.
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+def bundle_url(language: str, version: str) -> str:
+    return f"/api/bundles/{language}.{version}.json"
+
+
+def compile_bundles(translations: dict, catalogue) -> dict:
+    """
+    Compile UI strings and crop names into one content-hashed bundle per
+    language. Returns {"bundles": {lang: (version, Precompressed)}, "manifest": Precompressed}.
+    """
+    bundles = {}
+    for lang, strings in translations.items():
+        body = dumps({
+            "language": lang,
+            "translations": strings,
+            "crop_names": {key: catalogue.name(i, lang) for i, key in enumerate(catalogue.keys)},
+        })
+        version = hashlib.sha256(body).hexdigest()[:12]
+        bundles[lang] = (version, Precompressed(body, "application/json", cache_control=IMMUTABLE))
+
+    manifest = Precompressed.from_json({
+        "languages": {
+            lang: {"version": version, "url": bundle_url(lang, version)}
+            for lang, (version, _) in bundles.items()
+        }
+    }, cache_control=REVALIDATE)
+
+    return {"bundles": bundles, "manifest": manifest}
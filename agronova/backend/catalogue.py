@@ -0,0 +1,459 @@
+"""
+Crop catalogue: data files, validation and the compiled artifact.
+
+Crops live in data/catalogue/crops/<key>.json, one file per crop,
+data/catalogue/catalogue.json lists the supported languages and the crop
+order (which breaks ties between equal recommendation scores), and
+data/catalogue/prices.json holds market prices (rupees per quintal).
+
+    python catalogue.py            # validate and compile data/catalogue.bin
+    python catalogue.py --check    # validate only
+
+The artifact is laid out as
+
+    b"AGROCAT3", u32 directory length, directory (JSON: crop count,
+    languages, soil/water vocabularies, byte order, source hash and the
+    [offset, length] of each section), then 8-byte aligned sections:
+
+      strings.offsets, strings.data   every distinct key, emoji, name and
+                                      tag once (u32 offsets + UTF-8)
+      key, emoji, names.<lang>,       u32 string ids, one per crop
+      season.<lang>, yield
+      tags.offsets, tags              u32 string ids, CSR layout
+      temp_min ... ph_max, yield_per_ha   float64, one per crop
+      cost_per_ha, price_per_quintal  int64, one per crop
+      soils, water                    u8 bitmasks, one per crop
+      text.<lang>                     JSON list of guidance blocks
+
+The engine memory-maps it: numeric sections are read in place through
+memoryview casts (one copy in the page cache for all workers), and names
+plus the season/yield lines recommendations show are decoded once and
+interned. A language's guidance text is decoded the first time it is
+used and kept in an LRU of CATALOGUE_TEXT_CACHE languages, so memory
+grows with the languages a deployment actually serves.
+
+A running server picks up edited data files without a restart: refresh()
+recompiles and opens the new artifact, and the app swaps it in (see
+crop_engine.set_catalogue and the CATALOGUE RELOAD section of main.py).
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+from metrics import CATALOGUE_TEXT_LOADS
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SOURCES_DIR = os.path.join(DATA_DIR, "catalogue")
+ARTIFACT_PATH = os.getenv("CROP_CATALOGUE_PATH", os.path.join(DATA_DIR, "catalogue.bin"))
+
+CATALOGUE_TEXT_CACHE = int(os.getenv("CATALOGUE_TEXT_CACHE", "4"))
+
+MAGIC = b"AGROCAT3"  # bumped whenever the layout changes
+
+SOILS = ("loamy", "silty", "clay", "sandy")
+WATER = ("high", "medium", "low", "none")
+SOIL_BITS = {name: 1 << i for i, name in enumerate(SOILS)}
+WATER_BITS = {name: 1 << i for i, name in enumerate(WATER)}
+
+FLOAT_FIELDS = ("temp_min", "temp_max", "rain_min", "rain_max", "ph_min", "ph_max")
+INFO_TEXT = ("season", "duration", "yield")
+INFO_LISTS = ("pre_planting", "post_planting")
+INFO_RECORDS = {"seeds": ("name", "yield", "type"), "fertilizers": ("name", "dose", "time")}
+
+
+# ─── VALIDATION ───────────────────────────────────────────────────────────────
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _validate_info(info, where: str) -> list:
+    if not isinstance(info, dict):
+        return [f"{where}: must be an object"]
+    errors = [f"{where}.{field}: must be a non-empty string"
+              for field in INFO_TEXT if not isinstance(info.get(field), str) or not info.get(field)]
+    for field in INFO_LISTS:
+        items = info.get(field)
+        if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+            errors.append(f"{where}.{field}: must be a list of strings")
+    for field, keys in INFO_RECORDS.items():
+        items = info.get(field)
+        if not isinstance(items, list) or not all(
+                isinstance(item, dict) and all(isinstance(item.get(k), str) for k in keys) for item in items):
+            errors.append(f"{where}.{field}: must be a list of objects with string {', '.join(keys)}")
+    return errors
+
+
+def validate_crop(crop: dict, languages: list) -> list:
+    """Problems with one crop definition (empty if it is valid)"""
+    key = crop.get("key")
+    where = key if isinstance(key, str) and key else "<crop without key>"
+    errors = []
+    if not isinstance(key, str) or not key:
+        errors.append(f"{where}: key must be a non-empty string")
+    if not isinstance(crop.get("emoji"), str):
+        errors.append(f"{where}: emoji must be a string")
+
+    names = crop.get("names")
+    if not isinstance(names, dict) or not isinstance(names.get("english"), str):
+        errors.append(f"{where}.names: must include an english name")
+    else:
+        errors += [f"{where}.names.{lang}: unknown language or not a string"
+                   for lang, name in names.items() if lang not in languages or not isinstance(name, str)]
+
+    c = crop.get("conditions")
+    if not isinstance(c, dict):
+        errors.append(f"{where}.conditions: must be an object")
+    else:
+        for field, vocabulary in (("soils", SOILS), ("water", WATER)):
+            values = c.get(field)
+            if not isinstance(values, list) or not values or not all(v in vocabulary for v in values):
+                errors.append(f"{where}.conditions.{field}: must be a non-empty list from {', '.join(vocabulary)}")
+        for field in FLOAT_FIELDS:
+            if not _is_number(c.get(field)):
+                errors.append(f"{where}.conditions.{field}: must be a number")
+        for low, high in (("temp_min", "temp_max"), ("rain_min", "rain_max"), ("ph_min", "ph_max")):
+            if _is_number(c.get(low)) and _is_number(c.get(high)) and c[low] > c[high]:
+                errors.append(f"{where}.conditions: {low} is above {high}")
+
+    info = crop.get("info")
+    if not isinstance(info, dict) or "english" not in info:
+        errors.append(f"{where}.info: must include english guidance")
+    else:
+        for lang, block in info.items():
+            if lang not in languages:
+                errors.append(f"{where}.info.{lang}: unknown language")
+            else:
+                errors += _validate_info(block, f"{where}.info.{lang}")
+
+    if not isinstance(crop.get("cost_per_ha"), int) or isinstance(crop.get("cost_per_ha"), bool) \
+            or crop["cost_per_ha"] < 0:
+        errors.append(f"{where}.cost_per_ha: must be a non-negative integer (rupees)")
+    if not _is_number(crop.get("yield_per_ha")) or crop["yield_per_ha"] < 0:
+        errors.append(f"{where}.yield_per_ha: must be a non-negative number (tonnes)")
+    if not isinstance(crop.get("tags"), list) or not all(isinstance(t, str) for t in crop["tags"]):
+        errors.append(f"{where}.tags: must be a list of strings")
+    return errors
+
+
+def validate_prices(prices: dict, keys: list) -> list:
+    """Problems with prices.json (empty if it is valid)"""
+    def valid(price):
+        return isinstance(price, int) and not isinstance(price, bool) and price > 0
+
+    errors = []
+    if not valid(prices.get("default_per_quintal")):
+        errors.append("prices.json: default_per_quintal must be a positive integer (rupees)")
+    per_quintal = prices.get("per_quintal")
+    if not isinstance(per_quintal, dict):
+        return errors + ["prices.json: per_quintal must be an object"]
+    for key, price in per_quintal.items():
+        if key not in keys:
+            errors.append(f"prices.json: per_quintal.{key}: not a crop in the catalogue")
+        elif not valid(price):
+            errors.append(f"prices.json: per_quintal.{key}: must be a positive integer (rupees)")
+    return errors
+
+
+def _load_json(directory: str, name: str) -> dict:
+    # A missing, half-written or wrongly shaped file is bad input, like a failed check
+    try:
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Invalid crop catalogue:\n  {name}: unreadable ({e})") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid crop catalogue:\n  {name}: must be a JSON object")
+    return data
+
+def read_sources(directory: str = SOURCES_DIR) -> tuple:
+    """
+    Load and validate the catalogue data files. Returns (languages, crops
+    in catalogue order, each with its price_per_quintal); raises ValueError
+    listing every problem found, or naming a file that cannot be read.
+    """
+    index = _load_json(directory, "catalogue.json")
+    languages, order = index.get("languages", []), index.get("crops", [])
+    for field, values in (("languages", languages), ("crops", order)):
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            raise ValueError(f"Invalid crop catalogue:\n  catalogue.json: {field} must be a list of strings")
+    errors = []
+    if "english" not in languages:
+        errors.append("catalogue.json: languages must include english")
+    if len(set(order)) != len(order):
+        errors.append("catalogue.json: crops are listed more than once")
+
+    crops_dir = os.path.join(directory, "crops")
+    try:
+        files = {name[:-5] for name in os.listdir(crops_dir) if name.endswith(".json")}
+    except OSError as e:
+        raise ValueError(f"Invalid crop catalogue:\n  crops/: unreadable ({e})") from e
+    errors += [f"crops/{key}.json: not listed in catalogue.json" for key in sorted(files - set(order))]
+
+    crops = []
+    for key in order:
+        if key not in files:
+            errors.append(f"catalogue.json: crops/{key}.json does not exist")
+            continue
+        crop = _load_json(directory, f"crops/{key}.json")
+        if crop.get("key") != key:
+            errors.append(f"crops/{key}.json: key is {crop.get('key')!r}, expected {key!r}")
+        errors += validate_crop(crop, languages)
+        crops.append(crop)
+
+    prices = _load_json(directory, "prices.json")
+    price_errors = validate_prices(prices, order)
+    if not price_errors:
+        for crop in crops:
+            crop["price_per_quintal"] = prices["per_quintal"].get(crop["key"], prices["default_per_quintal"])
+    errors += price_errors
+
+    if errors:
+        raise ValueError("Invalid crop catalogue:\n  " + "\n  ".join(errors))
+    return languages, crops
+
+
+def source_hash(directory: str = SOURCES_DIR) -> str:
+    digest = hashlib.sha256()
+    for root, _, names in sorted(os.walk(directory)):
+        for name in sorted(names):
+            with open(os.path.join(root, name), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read() + b"\0")
+    return digest.hexdigest()[:16]
+
+
+# ─── COMPILER ─────────────────────────────────────────────────────────────────
+
+def compile_catalogue(crops: list, languages: list, source: str = "") -> bytes:
+    """Compile validated crop definitions into the artifact format"""
+    strings, string_ids = [], {}
+
+    def sid(text: str) -> int:
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text)
+        return string_ids[text]
+
+    sections = {
+        "key": array("I", (sid(c["key"]) for c in crops)),
+        "emoji": array("I", (sid(c["emoji"]) for c in crops)),
+    }
+    for lang in languages:
+        sections[f"names.{lang}"] = array("I", (sid(c["names"].get(lang, c["names"]["english"])) for c in crops))
+        sections[f"season.{lang}"] = array("I", (sid(c["info"].get(lang, c["info"]["english"])["season"])
+                                                 for c in crops))
+    sections["yield"] = array("I", (sid(c["info"]["english"]["yield"]) for c in crops))
+    tag_offsets, tags = array("I", [0]), array("I")
+    for c in crops:
+        tags.extend(sid(tag) for tag in c["tags"])
+        tag_offsets.append(len(tags))
+    sections["tags.offsets"], sections["tags"] = tag_offsets, tags
+
+    for field in FLOAT_FIELDS:
+        sections[field] = array("d", (c["conditions"][field] for c in crops))
+    sections["yield_per_ha"] = array("d", (c["yield_per_ha"] for c in crops))
+    sections["cost_per_ha"] = array("q", (c["cost_per_ha"] for c in crops))
+    sections["price_per_quintal"] = array("q", (c["price_per_quintal"] for c in crops))
+    sections["soils"] = array("B", (sum(SOIL_BITS[s] for s in set(c["conditions"]["soils"])) for c in crops))
+    sections["water"] = array("B", (sum(WATER_BITS[w] for w in set(c["conditions"]["water"])) for c in crops))
+
+    for lang in languages:
+        # null where a crop has no text in this language (English is used)
+        sections[f"text.{lang}"] = json.dumps([c["info"].get(lang) for c in crops], ensure_ascii=False,
+                                              separators=(",", ":")).encode("utf-8")
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = array("I", [0])
+    for text in encoded:
+        offsets.append(offsets[-1] + len(text))
+    sections["strings.offsets"], sections["strings.data"] = offsets, b"".join(encoded)
+
+    body, layout = bytearray(), {}
+    for name, data in sections.items():
+        data = data.tobytes() if isinstance(data, array) else data
+        body += b"\0" * (-len(body) % 8)
+        layout[name] = [len(body), len(data)]
+        body += data
+
+    directory = json.dumps({
+        "crops": len(crops), "languages": languages, "soils": SOILS, "water": WATER,
+        "byteorder": sys.byteorder, "source_hash": source, "sections": layout,
+    }).encode("utf-8")
+    header = MAGIC + struct.pack("<I", len(directory)) + directory
+    return header + b"\0" * (-len(header) % 8) + bytes(body)
+
+
+def build(directory: str = SOURCES_DIR, path: str = ARTIFACT_PATH) -> int:
+    """Validate the data files and (atomically) write the artifact; returns its size"""
+    languages, crops = read_sources(directory)
+    data = compile_catalogue(crops, languages, source_hash(directory))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)  # readers keep their mapping of the old file
+    return len(data)
+
+
+# ─── LOADER ───────────────────────────────────────────────────────────────────
+
+class Catalogue:
+    """Read-only view of a compiled catalogue held in bytes or a memory map"""
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        if bytes(view[:8]) != MAGIC:
+            raise ValueError("Not a crop catalogue artifact, or one from an older format")
+        (size,) = struct.unpack_from("<I", view, 8)
+        directory = json.loads(bytes(view[12:12 + size]))
+        if directory["byteorder"] != sys.byteorder:
+            raise ValueError("Crop catalogue was compiled on a machine with another byte order; rebuild it")
+        base = 12 + size + (-(12 + size) % 8)
+        layout = directory["sections"]
+
+        def section(name: str, fmt: str = None) -> memoryview:
+            offset, length = layout[name]
+            part = view[base + offset:base + offset + length]
+            return part.cast(fmt) if fmt else part
+
+        self._buffer = buffer  # keeps the memory map open
+        self.version = 0  # assigned by crop_engine.set_catalogue
+        self.source_hash = directory["source_hash"]
+        self.languages = directory["languages"]
+
+        offsets, data = section("strings.offsets", "I"), bytes(section("strings.data"))
+        strings = [sys.intern(data[offsets[i]:offsets[i + 1]].decode("utf-8")) for i in range(len(offsets) - 1)]
+        lookup = lambda name: [strings[i] for i in section(name, "I")]
+
+        self.keys = lookup("key")
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.emoji = lookup("emoji")
+        self.names = {lang: lookup(f"names.{lang}") for lang in self.languages}
+        self.seasons = {lang: lookup(f"season.{lang}") for lang in self.languages}
+        self.yields = lookup("yield")  # English, as shown on recommendation cards
+        tag_offsets, tags = section("tags.offsets", "I"), lookup("tags")
+        self.tags = [tags[tag_offsets[i]:tag_offsets[i + 1]] for i in range(len(self.keys))]
+
+        for field in FLOAT_FIELDS + ("yield_per_ha",):
+            setattr(self, field, section(field, "d"))
+        self.cost_per_ha = section("cost_per_ha", "q")
+        self.price_per_quintal = section("price_per_quintal", "q")
+        self.soils = section("soils", "B")
+        self.water = section("water", "B")
+        self._sections = {lang: section(f"text.{lang}") for lang in self.languages}
+        self._text = OrderedDict()  # language -> decoded guidance blocks, LRU
+        self._text_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def name(self, i: int, lang: str) -> str:
+        return self.names.get(lang, self.names["english"])[i]
+
+    def season(self, i: int, lang: str) -> str:
+        return self.seasons.get(lang, self.seasons["english"])[i]
+
+    def text(self, lang: str) -> list:
+        """Guidance blocks for a language, decoded from the artifact on first use"""
+        with self._text_lock:
+            blocks = self._text.get(lang)
+            if blocks is not None:
+                self._text.move_to_end(lang)
+                return blocks
+        blocks = json.loads(bytes(self._sections[lang]))
+        CATALOGUE_TEXT_LOADS.inc(lang)
+        with self._text_lock:
+            self._text[lang] = blocks
+            while len(self._text) > max(CATALOGUE_TEXT_CACHE, 1):
+                self._text.popitem(last=False)
+        return blocks
+
+    def text_languages(self) -> int:
+        """Languages whose guidance text is currently decoded"""
+        return len(self._text)
+
+    def info(self, i: int, lang: str) -> dict:
+        """Guidance text for crop i, falling back to English"""
+        block = self.text(lang)[i] if lang in self._sections else None
+        return block if block is not None else self.text("english")[i]
+
+
+def open_catalogue(path: str = ARTIFACT_PATH) -> Catalogue:
+    with open(path, "rb") as f:
+        return Catalogue(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def artifact_source_hash(path: str = ARTIFACT_PATH) -> str:
+    """Source hash recorded in an artifact, reading only its header"""
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if header[:8] != MAGIC:
+            return ""
+        (size,) = struct.unpack_from("<I", header, 8)
+        return json.loads(f.read(size))["source_hash"]
+
+
+def _sources_newer(path: str, directory: str) -> bool:
+    try:
+        built = os.path.getmtime(path)
+    except OSError:
+        return True
+    return any(os.path.getmtime(os.path.join(root, name)) > built
+               for root, _, names in os.walk(directory) for name in names)
+
+
+def load_catalogue(path: str = ARTIFACT_PATH, directory: str = SOURCES_DIR) -> Catalogue:
+    """
+    Open the artifact, compiling it first if it is missing, older than the
+    data files or in an older format
+    """
+    if not _sources_newer(path, directory):
+        try:
+            return open_catalogue(path)
+        except ValueError:
+            pass
+    print("⚠️ Crop catalogue artifact missing or out of date; compiling data/catalogue")
+    build(directory, path)
+    return open_catalogue(path)
+
+
+def refresh(current: Catalogue, path: str = ARTIFACT_PATH, directory: str = SOURCES_DIR,
+            force: bool = False):
+    """
+    Recompile the artifact if the data files changed (always, with force),
+    then open it if it was built from other sources than `current`. Returns
+    the new Catalogue or None; raises ValueError, leaving the artifact
+    alone, if the data files are invalid. Blocking: run it in a thread.
+    """
+    if force or _sources_newer(path, directory):
+        build(directory, path)
+    if artifact_source_hash(path) == current.source_hash:
+        return None
+    return open_catalogue(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate and compile the crop catalogue")
+    parser.add_argument("--sources", default=SOURCES_DIR)
+    parser.add_argument("--output", default=ARTIFACT_PATH)
+    parser.add_argument("--check", action="store_true", help="validate only, write nothing")
+    args = parser.parse_args()
+    try:
+        if args.check:
+            languages, crops = read_sources(args.sources)
+            print(f"✅ {len(crops)} crops, {len(languages)} languages: valid")
+        else:
+            size = build(args.sources, args.output)
+            print(f"✅ Compiled {args.output} ({size:,} bytes)")
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 import os
-import requests
 import json
+import time
+from http_client import get_client
+from metrics import UPSTREAM_DURATION
+from tracing import span
 
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
+ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com")
 
 SYSTEM_PROMPTS = {
     "english": """You are AgroNova's AI farming assistant. You help Indian farmers with crop advice.
@@ -25,8 +29,8 @@ Always be encouraging and respectful to farmers.""",
 नेहमी शेतकऱ्यांशी आदराने आणि प्रोत्साहनाने बोला."""
 }
 
-def chat_with_farmer(message: str, language: str = "english",
-                     context: dict = {}, history: list = []) -> str:
+async def chat_with_farmer(message: str, language: str = "english",
+                           context: dict = {}, history: list = []) -> str:
     """
     Chat with farmer using Claude AI.
     Falls back to rule-based responses if no API key.
@@ -38,6 +42,11 @@ def chat_with_farmer(message: str, language: str = "english",
     if not ANTHROPIC_API_KEY:
         return get_rule_based_response(message, lang, context)
 
+    import httpx
+    start = time.perf_counter()
+    def observe(outcome: str):
+        UPSTREAM_DURATION.observe(time.perf_counter() - start, "anthropic", outcome)
+
     try:
         # Build context string
         context_str = ""
@@ -52,29 +61,41 @@ def chat_with_farmer(message: str, language: str = "english",
             messages.append({"role": h["role"], "content": h["content"]})
         messages.append({"role": "user", "content": message})
 
-        response = requests.post(
-            "https://api.anthropic.com/v1/messages",
-            headers={
-                "x-api-key": ANTHROPIC_API_KEY,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json"
-            },
-            json={
-                "model": "claude-haiku-4-5-20251001",
-                "max_tokens": 300,
-                "system": system,
-                "messages": messages
-            },
-            timeout=15
-        )
-
-        if response.status_code == 200:
-            data = response.json()
-            return data["content"][0]["text"]
-        else:
+        with span("anthropic POST /v1/messages", language=lang) as s:
+            response = await get_client().post(
+                f"{ANTHROPIC_BASE_URL}/v1/messages",
+                headers={
+                    "x-api-key": ANTHROPIC_API_KEY,
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json"
+                },
+                json={
+                    "model": "claude-haiku-4-5-20251001",
+                    "max_tokens": 300,
+                    "system": system,
+                    "messages": messages
+                },
+                timeout=15
+            )
+            s.set_attribute("http.status_code", response.status_code)
+
+        if response.status_code != 200:
+            observe("404" if response.status_code == 404 else "error")
             return get_rule_based_response(message, lang, context)
 
+        # Outcome is recorded once, after the reply parsed (a bad body lands in "error")
+        reply = response.json()["content"][0]["text"]
+        observe("success")
+        return reply
+
+    except httpx.ConnectError:
+        observe("fallback")
+        return get_rule_based_response(message, lang, context)
+    except httpx.TimeoutException:
+        observe("timeout")
+        return get_rule_based_response(message, lang, context)
     except Exception:
+        observe("error")
         return get_rule_based_response(message, lang, context)
 
 
@@ -0,0 +1,69 @@
+"""
+Per-geocell climatology learned from the observations we fetch.
+
+Every upstream observation updates its geocell's running aggregates:
+count, mean and variance of temperature and humidity (Welford's online
+algorithm), and per calendar month the number of observations and the sum
+of their last-hour rainfall. A cell is one fixed-size packed record in the
+climate_cells table, updated in a single write transaction so workers and
+ingest.py all add to the same totals.
+
+A cell's annual rainfall normal is, summed over the months, the mean
+hourly rain rate times the hours in the month. It replaces the regional
+zone estimate once every month has CLIMATE_MIN_MONTH_SAMPLES observations.
+"""
+import math
+import os
+import struct
+
+from database import update_climate_cell
+
+CLIMATE_MIN_MONTH_SAMPLES = int(os.getenv("CLIMATE_MIN_MONTH_SAMPLES", "24"))
+HOURS_IN_MONTH = (744, 678, 744, 720, 744, 720, 744, 744, 720, 744, 720, 744)  # February: 28.25 days
+
+# count, temperature mean/M2, humidity mean/M2, 12 month counts, 12 month rain sums (mm)
+_RECORD = struct.Struct("<I4d12I12d")
+_EMPTY = (0, 0.0, 0.0, 0.0, 0.0) + (0,) * 12 + (0.0,) * 12
+
+
+def _welford(n: int, mean: float, m2: float, x: float) -> tuple:
+    delta = x - mean
+    mean += delta / n
+    return mean, m2 + delta * (x - mean)
+
+
+def add_observation(stats: bytes, temperature: float, humidity: float, rain_1h: float, month: int) -> bytes:
+    """Packed stats with one observation added (stats=None starts a new cell)"""
+    v = list(_RECORD.unpack(stats) if stats else _EMPTY)
+    v[0] += 1
+    v[1], v[2] = _welford(v[0], v[1], v[2], temperature)
+    v[3], v[4] = _welford(v[0], v[3], v[4], humidity)
+    v[4 + month] += 1
+    v[16 + month] += rain_1h
+    return _RECORD.pack(*v)
+
+
+def normals(stats: bytes) -> dict:
+    """Learned normals; rainfall_annual_mm is None until every month has enough samples"""
+    n, t_mean, t_m2, h_mean, h_m2, *months = _RECORD.unpack(stats)
+    counts, rain = months[:12], months[12:]
+    std = lambda m2: round(math.sqrt(m2 / (n - 1)), 1) if n > 1 else 0.0
+    rainfall = None
+    if min(counts) >= CLIMATE_MIN_MONTH_SAMPLES:
+        rainfall = round(sum(total / count * hours for total, count, hours in zip(rain, counts, HOURS_IN_MONTH)))
+    return {
+        "samples": n,
+        "temperature_mean": round(t_mean, 1),
+        "temperature_std": std(t_m2),
+        "humidity_mean": round(h_mean, 1),
+        "humidity_std": std(h_m2),
+        "months_covered": sum(count >= CLIMATE_MIN_MONTH_SAMPLES for count in counts),
+        "rainfall_annual_mm": rainfall,
+    }
+
+
+def observe(cell: tuple, temperature: float, humidity: float, rain_1h: float, month: int) -> dict:
+    """Add one observation to a geocell (blocking: run in a thread); returns its normals"""
+    stats = update_climate_cell(cell[0], cell[1],
+                                lambda old: add_observation(old, temperature, humidity, rain_1h, month))
+    return normals(stats)
@@ -0,0 +1,148 @@
+import gzip
+import hashlib
+import importlib.util
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+from fastjson import dumps
+from tracing import span
+
+# brotli is optional (gzip only without it) and imported on first use
+HAS_BROTLI = importlib.util.find_spec("brotli") is not None
+
+# Responses smaller than this are sent as-is; the encoding overhead and
+# CPU cost outweigh the saving on tiny JSON bodies.
+MINIMUM_SIZE = 500
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5          # on-the-fly: fast enough per request
+BROTLI_QUALITY_STATIC = 11  # precompressed once at startup: smallest output
+
+
+def choose_encoding(accept_encoding: str) -> str:
+    """Pick the best encoding the client accepts: br, then gzip, else identity"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        params = params.strip()
+        try:
+            q = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            q = 1.0
+        if q > 0:
+            accepted.add(token.strip())
+    if HAS_BROTLI and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return "identity"
+
+
+def compress(body: bytes, encoding: str, static: bool = False) -> bytes:
+    if encoding == "br":
+        import brotli
+        return brotli.compress(body, quality=BROTLI_QUALITY_STATIC if static else BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=9 if static else GZIP_LEVEL, mtime=0)
+    return body
+
+
+class Precompressed:
+    """
+    A fixed payload encoded once (identity, gzip, br) and served with the
+    variant the client negotiates. Used for index.html and cached JSON.
+    """
+
+    def __init__(self, body: bytes, media_type: str, cache_control: str = "no-cache"):
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        self.variants = {"identity": body}
+        if len(body) >= MINIMUM_SIZE:
+            self.variants["gzip"] = compress(body, "gzip", static=True)
+            if HAS_BROTLI:
+                self.variants["br"] = compress(body, "br", static=True)
+
+    @classmethod
+    def from_file(cls, path: str, media_type: str, **kwargs) -> "Precompressed":
+        with open(path, "rb") as f:
+            return cls(f.read(), media_type, **kwargs)
+
+    @classmethod
+    def from_json(cls, content, **kwargs) -> "Precompressed":
+        return cls(dumps(content), "application/json", **kwargs)
+
+    def response(self, headers: Headers) -> Response:
+        common = {
+            "ETag": self.etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = headers.get("if-none-match", "")
+        if self.etag in [t.strip() for t in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=common)
+
+        encoding = choose_encoding(headers.get("accept-encoding", ""))
+        if encoding not in self.variants:
+            encoding = "identity"
+        if encoding != "identity":
+            common["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], media_type=self.media_type, headers=common)
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip/brotli compression for dynamic responses.
+
+    Only single-chunk bodies above MINIMUM_SIZE are compressed; streamed or
+    already-encoded responses (e.g. Precompressed) pass through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            # First body chunk: decide whether to compress
+            headers = MutableHeaders(raw=list(start_message["headers"]))
+            body = message.get("body", b"")
+            if (message.get("more_body", False)
+                    or "content-encoding" in headers
+                    or len(body) < self.minimum_size):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            with span("compress", encoding=encoding, size=len(body)):
+                compressed = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            start_message["headers"] = headers.raw
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
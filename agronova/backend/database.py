@@ -1,99 +1,207 @@
 import sqlite3
 import json
+import os
+import queue
+import functools
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from metrics import DB_DURATION
+from tracing import span
 
-DB_PATH = "agronova.db"
+DB_PATH = os.getenv("AGRONOVA_DB_PATH", "agronova.db")
+POOL_SIZE = 4
 
+# Pool of open connections, filled by init_db() and drained by close_db().
+# Opening a SQLite connection per call costs a file open + schema read, so
+# the app lifespan keeps a few around and hands them out to worker threads.
+_pool = queue.LifoQueue()
+
+# The schema is created by the first caller — the background warm-up in
+# main.py, or the first request if it gets here before warm-up does.
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+@contextmanager
+def get_connection():
+    """Borrow a pooled connection, committing on success"""
+    if not _schema_ready:
+        init_db()
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _connect()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if _pool.qsize() < POOL_SIZE:
+            _pool.put(conn)
+        else:
+            conn.close()
+
+def timed(fn):
+    """Record the operation's latency (and a trace span) under its function name"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with span(f"sqlite {fn.__name__}", **{"db.system": "sqlite"}):
+                return fn(*args, **kwargs)
+        finally:
+            DB_DURATION.observe(time.perf_counter() - start, fn.__name__)
+    return wrapper
+
+@timed
 def init_db():
-    """Initialize SQLite database with required tables"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            created_at TEXT NOT NULL,
-            location TEXT,
-            temperature REAL,
-            rainfall REAL,
-            soil_type TEXT,
-            water_level TEXT,
-            recommended_crops TEXT,
-            selected_crop TEXT,
-            language TEXT DEFAULT 'english'
-        )
-    """)
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS chat_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_id INTEGER,
-            timestamp TEXT NOT NULL,
-            role TEXT NOT NULL,
-            message TEXT NOT NULL,
-            language TEXT DEFAULT 'english',
-            FOREIGN KEY (session_id) REFERENCES sessions(id)
-        )
-    """)
+    """Initialize SQLite database with required tables (idempotent)"""
+    global _schema_ready
+    with _schema_lock:
+        if _schema_ready:
+            return
+        conn = _connect()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT NOT NULL,
+                location TEXT,
+                temperature REAL,
+                rainfall REAL,
+                soil_type TEXT,
+                water_level TEXT,
+                recommended_crops TEXT,
+                selected_crop TEXT,
+                language TEXT DEFAULT 'english'
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS chat_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id INTEGER,
+                timestamp TEXT NOT NULL,
+                role TEXT NOT NULL,
+                message TEXT NOT NULL,
+                language TEXT DEFAULT 'english',
+                FOREIGN KEY (session_id) REFERENCES sessions(id)
+            )
+        """)
+
+        # Written by ingest.py, read by every worker (weather.load_snapshots)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS weather_snapshots (
+                district TEXT PRIMARY KEY,
+                state TEXT,
+                names TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                data TEXT NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_weather_snapshots_fetched ON weather_snapshots(fetched_at)")
+
+        # Normalized place name -> provider coordinates (geocoding.py);
+        # found = 0 rows are negative results that expire
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS geocodes (
+                query TEXT PRIMARY KEY,
+                found INTEGER NOT NULL,
+                name TEXT,
+                lat REAL,
+                lon REAL,
+                country TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+
+        # Per-geocell running aggregates (climatology.py), one packed record each
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS climate_cells (
+                cell_row INTEGER NOT NULL,
+                cell_col INTEGER NOT NULL,
+                stats BLOB NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (cell_row, cell_col)
+            ) WITHOUT ROWID
+        """)
+
+        conn.commit()
+        _pool.put(conn)
+        _schema_ready = True
 
-    conn.commit()
-    conn.close()
     print("✅ Database initialized successfully")
 
+def close_db():
+    """Close all pooled connections (called once at shutdown)"""
+    while True:
+        try:
+            _pool.get_nowait().close()
+        except queue.Empty:
+            break
+
+def _reset_after_fork():
+    # SQLite connections must not cross fork(); a forked worker opens its own
+    global _pool, _schema_lock
+    _pool = queue.LifoQueue()
+    _schema_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+@timed
 def save_session(data: dict) -> int:
     """Save a farmer session and return session ID"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        INSERT INTO sessions 
-        (created_at, location, temperature, rainfall, soil_type, water_level, recommended_crops, language)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        datetime.now().isoformat(),
-        data.get("location", ""),
-        data.get("temperature", 0),
-        data.get("rainfall", 0),
-        data.get("soil_type", ""),
-        data.get("water_level", ""),
-        json.dumps(data.get("recommended_crops", [])),
-        data.get("language", "english")
-    ))
-
-    session_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return session_id
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO sessions 
+            (created_at, location, temperature, rainfall, soil_type, water_level, recommended_crops, language)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            datetime.now().isoformat(),
+            data.get("location", ""),
+            data.get("temperature", 0),
+            data.get("rainfall", 0),
+            data.get("soil_type", ""),
+            data.get("water_level", ""),
+            json.dumps(data.get("recommended_crops", [])),
+            data.get("language", "english")
+        ))
+        return cursor.lastrowid
 
+@timed
 def update_selected_crop(session_id: int, crop_key: str):
     """Update session with selected crop"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE sessions SET selected_crop = ? WHERE id = ?",
-        (crop_key, session_id)
-    )
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        conn.execute(
+            "UPDATE sessions SET selected_crop = ? WHERE id = ?",
+            (crop_key, session_id)
+        )
 
+@timed
 def save_chat(session_id: int, role: str, message: str, language: str = "english"):
     """Save a chat message"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO chat_logs (session_id, timestamp, role, message, language)
-        VALUES (?, ?, ?, ?, ?)
-    """, (session_id, datetime.now().isoformat(), role, message, language))
-    conn.commit()
-    conn.close()
+    with get_connection() as conn:
+        conn.execute("""
+            INSERT INTO chat_logs (session_id, timestamp, role, message, language)
+            VALUES (?, ?, ?, ?, ?)
+        """, (session_id, datetime.now().isoformat(), role, message, language))
 
+@timed
 def get_session(session_id: int) -> dict:
     """Get session data by ID"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM sessions WHERE id = ?", (session_id,))
-    row = cursor.fetchone()
-    conn.close()
+    with get_connection() as conn:
+        row = conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
 
     if not row:
         return None
@@ -110,3 +218,78 @@ def get_session(session_id: int) -> dict:
         "selected_crop": row[8],
         "language": row[9]
     }
+
+@timed
+def save_weather_snapshot(district: str, state: str, names: list, fetched_at: float, data: dict):
+    """Insert or replace the current-conditions snapshot for a district"""
+    with get_connection() as conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO weather_snapshots (district, state, names, fetched_at, data)
+            VALUES (?, ?, ?, ?, ?)
+        """, (district, state, json.dumps(names, ensure_ascii=False), fetched_at,
+              json.dumps(data, ensure_ascii=False)))
+
+@timed
+def get_weather_snapshots(since: float = 0) -> list:
+    """Snapshots fetched after `since` (unix time) as dicts, oldest first"""
+    with get_connection() as conn:
+        rows = conn.execute("""
+            SELECT district, state, names, fetched_at, data FROM weather_snapshots
+            WHERE fetched_at > ? ORDER BY fetched_at
+        """, (since,)).fetchall()
+
+    return [{
+        "district": row[0],
+        "state": row[1],
+        "names": json.loads(row[2]),
+        "fetched_at": row[3],
+        "data": json.loads(row[4])
+    } for row in rows]
+
+@timed
+def save_geocode(query: str, place: dict):
+    """Insert or replace the geocode for a normalized place name"""
+    with get_connection() as conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO geocodes (query, found, name, lat, lon, country, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (query, int(place["found"]), place["name"], place["lat"], place["lon"],
+              place["country"], place["updated_at"]))
+
+@timed
+def get_geocode(query: str) -> dict:
+    """Geocode for a normalized place name, or None if never looked up"""
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT found, name, lat, lon, country, updated_at FROM geocodes WHERE query = ?", (query,)
+        ).fetchone()
+
+    if not row:
+        return None
+
+    return {
+        "found": bool(row[0]),
+        "name": row[1],
+        "lat": row[2],
+        "lon": row[3],
+        "country": row[4],
+        "updated_at": row[5]
+    }
+
+@timed
+def update_climate_cell(row: int, col: int, update) -> bytes:
+    """
+    Replace a geocell's stats with update(current stats or None) inside one
+    write transaction, so concurrent writers don't lose observations.
+    """
+    with get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        found = conn.execute(
+            "SELECT stats FROM climate_cells WHERE cell_row = ? AND cell_col = ?", (row, col)
+        ).fetchone()
+        stats = update(found[0] if found else None)
+        conn.execute("""
+            INSERT OR REPLACE INTO climate_cells (cell_row, cell_col, stats, updated_at)
+            VALUES (?, ?, ?, ?)
+        """, (row, col, stats, time.time()))
+    return stats
@@ -0,0 +1,88 @@
+import json
+import os
+
+from fastapi import Depends, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
+
+from tracing import span
+
+try:
+    import orjson
+except ImportError:  # orjson is optional — stdlib json is used instead
+    orjson = None
+
+# orjson is used when installed; set AGRONOVA_FAST_JSON=0 to force stdlib json
+FAST_JSON = orjson is not None and os.getenv("AGRONOVA_FAST_JSON", "1") != "0"
+
+
+def dumps(content) -> bytes:
+    """
+    Serialize to the same compact UTF-8 bytes as FastAPI's JSONResponse,
+    using orjson when enabled.
+    """
+    if FAST_JSON:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with dumps(). Routes return it directly with
+    plain dicts/lists, which also skips FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content) -> bytes:
+        with span("json.encode"):
+            return dumps(content)
+
+
+def json_body(model: type[BaseModel]):
+    """
+    Dependency that validates the raw request body with pydantic's
+    model_validate_json, skipping the json.loads -> dict -> validate
+    round trip. Errors surface as the usual 422 response.
+    """
+    async def parse(request: Request) -> BaseModel:
+        body = await request.body()
+        try:
+            return model.model_validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**err, "loc": ("body",) + tuple(err["loc"])} for err in e.errors()]
+            )
+
+    return Depends(parse)
+
+
+# Models nested in body_schema() bodies, added to the OpenAPI components
+# by install_body_schemas() so their $refs resolve in /openapi.json
+_nested_schemas = {}
+
+
+def body_schema(model: type[BaseModel]) -> dict:
+    """openapi_extra that documents a json_body() model as the request body"""
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    _nested_schemas.update(schema.pop("$defs", {}))
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}},
+        }
+    }
+
+
+def install_body_schemas(app):
+    """Register the models nested in body_schema() bodies under components/schemas"""
+    generate = app.openapi
+
+    def openapi() -> dict:
+        if app.openapi_schema is None:
+            components = generate().setdefault("components", {}).setdefault("schemas", {})
+            for name, schema in _nested_schemas.items():
+                components.setdefault(name, schema)
+        return app.openapi_schema
+
+    app.openapi = openapi
@@ -0,0 +1,75 @@
+"""
+Persistent place-name -> coordinates cache.
+
+Place names don't move, so the first successful q= weather lookup for a
+name records the provider's canonical name and lat/lon in SQLite, and
+every later lookup for that name goes by coordinates. Names the provider
+doesn't know are recorded as negative results for GEOCODE_NEGATIVE_TTL,
+so a typo isn't sent upstream (twice, with the ",IN" retry) on every try.
+
+Entries are held in memory once read; a worker that hasn't seen a name
+checks SQLite before going upstream, so all workers share what any one
+of them resolved.
+"""
+import asyncio
+import os
+import time
+import unicodedata
+
+from database import get_geocode, save_geocode
+from metrics import GEOCODE_LOOKUPS
+
+GEOCODE_NEGATIVE_TTL = float(os.getenv("GEOCODE_NEGATIVE_TTL", "86400"))
+GEOCODE_MEMORY_SIZE = 50000
+
+NOT_FOUND = {"found": False}
+
+_memory = {}  # normalized name -> geocode row (see database.get_geocode)
+
+# Zero-width (non-)joiners change how Devanagari conjuncts render but not
+# which place is meant; keyboards insert them inconsistently.
+_INVISIBLE = dict.fromkeys(map(ord, "\u200b\u200c\u200d\ufeff"))
+
+
+def normalize_place(name: str) -> str:
+    """Canonical lookup key: NFC, case-folded, punctuation dropped, single spaces"""
+    text = unicodedata.normalize("NFC", name).translate(_INVISIBLE).casefold()
+    text = "".join(" " if unicodedata.category(ch).startswith("P") else ch for ch in text)
+    return " ".join(text.split())
+
+
+async def lookup(key: str):
+    """
+    Cached geocode for a normalized name: a row with found=True, NOT_FOUND
+    for a live negative result, or None if the provider must be asked.
+    """
+    row = _memory.get(key)
+    if row is None:
+        row = await asyncio.to_thread(get_geocode, key)
+        if row is None:
+            GEOCODE_LOOKUPS.inc("miss")
+            return None
+        _remember(key, row)
+
+    if row["found"]:
+        GEOCODE_LOOKUPS.inc("hit")
+        return row
+    if row["updated_at"] + GEOCODE_NEGATIVE_TTL > time.time():
+        GEOCODE_LOOKUPS.inc("negative")
+        return NOT_FOUND
+    GEOCODE_LOOKUPS.inc("miss")
+    return None
+
+
+async def record(key: str, name: str = None, lat: float = None, lon: float = None, country: str = ""):
+    """Store a resolved place, or a negative result when name is None"""
+    row = {"found": name is not None, "name": name, "lat": lat, "lon": lon,
+           "country": country, "updated_at": time.time()}
+    _remember(key, row)
+    await asyncio.to_thread(save_geocode, key, row)
+
+
+def _remember(key: str, row: dict):
+    if key not in _memory and len(_memory) >= GEOCODE_MEMORY_SIZE:
+        _memory.pop(next(iter(_memory)))
+    _memory[key] = row
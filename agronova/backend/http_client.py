@@ -0,0 +1,43 @@
+# Shared async HTTP client for all upstream calls (OpenWeatherMap, Anthropic).
+# Opened and closed by the app lifespan in main.py so connections are pooled
+# and reused across requests instead of a new TCP/TLS handshake per call.
+# httpx is imported on first use: it is the slowest import in the app and
+# demo mode never needs it.
+
+import os
+
+_client = None
+
+
+def start_client():
+    """Create the shared HTTP client (called once at startup)"""
+    global _client
+    if _client is None:
+        import httpx
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared HTTP client (called once at shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_client():
+    """Return the shared client, creating it lazily outside the app (scripts, REPL)"""
+    return _client or start_client()
+
+
+def _reset_after_fork():
+    # Sockets and the event loop belong to the parent; a forked worker builds its own
+    global _client
+    _client = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
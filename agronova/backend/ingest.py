@@ -0,0 +1,108 @@
+"""
+Bulk weather ingestion: current conditions for every district we serve,
+written to the weather_snapshots table that interactive lookups read.
+
+    python ingest.py                       # one pass, then exit (cron)
+    python ingest.py --every 3600          # keep running, one pass an hour
+    python ingest.py --max-age 0           # refresh every district now
+
+Districts come from data/districts.json. A pass only fetches districts
+whose snapshot is older than --max-age, and each snapshot is committed as
+soon as it arrives, so an interrupted pass resumes where it stopped.
+
+OpenWeatherMap's multi-city endpoints (group by city ID, box/city) are
+deprecated and need provider city IDs, so calls are made per district by
+coordinates with bounded concurrency, paced by a token bucket holding
+ingest's share of the plan limit (see quota.py); the API workers split
+the rest.
+
+Against the stub upstream (bench/stubs.py):
+    OPENWEATHER_API_KEY=stub OPENWEATHER_BASE_URL=http://127.0.0.1:9100 python ingest.py
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import weather
+from database import get_weather_snapshots, save_weather_snapshot
+from http_client import close_client
+from quota import TokenBucket
+from weather import OPENWEATHER_API_KEY, OPENWEATHER_INGEST_CALLS_PER_MINUTE, fetch_weather_by_coords
+
+DISTRICTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "districts.json")
+
+
+def load_districts(path: str = DISTRICTS_PATH) -> list:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def due_districts(districts: list, max_age: float) -> list:
+    """Districts with no snapshot, or one older than max_age seconds"""
+    fetched = {row["district"]: row["fetched_at"] for row in get_weather_snapshots()}
+    cutoff = time.time() - max_age
+    return [d for d in districts if fetched.get(d["name"].lower(), 0) <= cutoff]
+
+
+async def ingest(districts: list, concurrency: int) -> dict:
+    """Fetch and store every district in `districts`; returns counts by outcome"""
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {"stored": 0, "failed": 0}
+
+    async def one(district: dict):
+        async with semaphore:
+            result = await fetch_weather_by_coords(district["lat"], district["lon"], wait=True)
+        if not result["success"] or result.get("demo_mode"):
+            counts["failed"] += 1
+            print(f"⚠️ {district['name']}: {result.get('error', 'upstream unreachable')}")
+            return
+        # Show the district, not the provider's nearest weather station
+        result = {**result, "location": district["name"], "district": district["name"]}
+        names = [district["name"], *district.get("aliases", [])]
+        await asyncio.to_thread(save_weather_snapshot, district["name"].lower(), district.get("state", ""),
+                                names, time.time(), result)
+        counts["stored"] += 1
+
+    await asyncio.gather(*(one(d) for d in districts))
+    return counts
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="AgroNova district weather ingestion")
+    parser.add_argument("--districts", default=DISTRICTS_PATH)
+    parser.add_argument("--max-age", type=float, default=3000,
+                        help="skip districts with a snapshot younger than this many seconds")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--per-minute", type=int, default=max(OPENWEATHER_INGEST_CALLS_PER_MINUTE, 1),
+                        help="upstream calls per minute for this job "
+                             "(default: OPENWEATHER_INGEST_CALLS_PER_MINUTE, which the API leaves free)")
+    parser.add_argument("--every", type=float, default=0, help="repeat every N seconds (0 = run once)")
+    args = parser.parse_args()
+
+    if not OPENWEATHER_API_KEY:
+        raise SystemExit("OPENWEATHER_API_KEY is not set; nothing to ingest in demo mode")
+
+    districts = load_districts(args.districts)
+    # This process's share of the key replaces the interactive default
+    weather.OPENWEATHER_QUOTA = TokenBucket(args.per_minute, burst=min(args.concurrency, args.per_minute))
+    try:
+        while True:
+            start = time.perf_counter()
+            due = await asyncio.to_thread(due_districts, districts, args.max_age)
+            counts = await ingest(due, args.concurrency)
+            print(json.dumps({"districts": len(districts), "due": len(due), **counts,
+                              "seconds": round(time.perf_counter() - start, 2)}))
+            if not args.every:
+                break
+            await asyncio.sleep(args.every)
+    finally:
+        await close_client()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("Interrupted; run again to resume with the remaining districts")
@@ -1,16 +1,97 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import Optional, List
-import os
-from weather import get_weather_by_location
-from crop_engine import recommend_crops, get_crop_guidance
-from chat import chat_with_farmer
-from database import init_db, save_session, get_session
-
-app = FastAPI(title="AgroNova API", version="1.0.0")
+import startup
+from startup import step
+
+# Import groups are timed so /api/ready can show where cold start goes
+with step("import fastapi"):
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI, HTTPException, Request, Depends
+    from fastapi.concurrency import run_in_threadpool
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.staticfiles import StaticFiles
+    from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse, PlainTextResponse, Response
+    from pydantic import BaseModel, Field, model_validator
+    from typing import Optional, List
+    import os
+    import asyncio
+    import secrets
+    import signal
+    import traceback
+with step("import crop_engine"):
+    from crop_engine import current_catalogue, set_catalogue, recommend_crops, get_crop_guidance, \
+        grid_axis, suitability_grid
+    from catalogue import refresh as refresh_catalogue
+    from portfolio import optimize_portfolio
+with step("import weather, chat, database"):
+    from weather import get_weather_by_location, get_weather_by_coords, get_demo_weather, run_prefetcher, run_snapshot_reloader
+    from chat import chat_with_farmer, get_rule_based_response
+    from database import init_db, close_db, save_session, get_session
+    from http_client import start_client, close_client
+with step("import serving modules"):
+    from compression import CompressionMiddleware, Precompressed, choose_encoding, compress
+    from fastjson import FastJSONResponse, json_body, body_schema, dumps, install_body_schemas
+    from bundles import compile_bundles, bundle_url
+    from metrics import MetricsMiddleware, render_latest, CATALOGUE_RELOADS
+    from admission import AdmissionMiddleware, CRITICAL, NORMAL, LOW, on_shed
+    from tracing import TracingMiddleware
+    from profiler import profiler, allocations
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../frontend")
+
+# Long-lived resources (DB pool, HTTP client, precompressed payloads) are
+# owned by the lifespan. Nothing slow runs before the port is bound: the
+# warm-up task builds them in the background and flips /api/ready when
+# done. Until then routes fall back to live (uncached) responses. If
+# warm-up fails, the worker logs why and shuts down rather than staying
+# unready.
+# Under serve.py the read-only payloads are already built by preload() in
+# the parent, so a worker's warm-up only opens its own DB pool and client.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not getattr(app.state, "preloaded", False):
+        app.state.precompressed = {}
+        app.state.bundles = None
+    warmup = asyncio.create_task(warm_up(app))
+    prefetcher = asyncio.create_task(run_prefetcher())
+    snapshots = asyncio.create_task(run_snapshot_reloader())
+    catalogue_watcher = asyncio.create_task(run_catalogue_watcher(app))
+    yield
+    warmup.cancel()
+    prefetcher.cancel()
+    snapshots.cancel()
+    catalogue_watcher.cancel()
+    await close_client()
+    close_db()
+
+async def warm_up(app: FastAPI):
+    try:
+        with step("init_db"):
+            await run_in_threadpool(init_db)
+        with step("http client"):
+            await run_in_threadpool(start_client)
+        if not getattr(app.state, "preloaded", False):
+            with step("precompress payloads"):
+                app.state.precompressed = await run_in_threadpool(build_precompressed)
+            with step("translation bundles"):
+                get_bundles(app)
+    except Exception as e:
+        # A worker without its DB or HTTP client would stay unready for good:
+        # say why, then shut down so serve.py (or the platform) restarts it
+        traceback.print_exc()
+        startup.mark_failed(f"{type(e).__name__}: {e}")
+        print("❌ Warm-up failed; shutting down")
+        os.kill(os.getpid(), signal.SIGTERM)
+        return
+    startup.mark_ready()
+    print(f"✅ Warm-up complete in {startup.report()['ready_after_ms']} ms")
+
+app = FastAPI(title="AgroNova API", version="1.0.0", lifespan=lifespan,
+              default_response_class=FastJSONResponse)
+install_body_schemas(app)
+
+# Middleware added later wraps what was added before, so the stack runs
+# outermost first: Tracing -> Metrics -> Admission -> Compression -> CORS.
+# The order is load-bearing: the trace context must wrap metrics and
+# admission, and metrics must time queueing and shed requests too.
 
 # Allow frontend to talk to backend
 app.add_middleware(
@@ -20,10 +101,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database on startup
-@app.on_event("startup")
-def startup():
-    init_db()
+# Negotiated gzip/brotli for dynamic JSON above the size threshold
+app.add_middleware(CompressionMiddleware)
+
+# Per-class concurrency budgets: onboarding and lookups ahead of chat, which
+# is shed to a rule-based reply instead of queuing behind a slow upstream
+app.add_middleware(AdmissionMiddleware, routes={
+    "/api/onboard": CRITICAL,
+    "/api/weather": CRITICAL,
+    "/api/weather/by-coords": CRITICAL,
+    "/api/recommend-crops": CRITICAL,
+    "/api/crop-guidance": NORMAL,
+    "/api/portfolio": NORMAL,
+    "/api/suitability-grid": LOW,
+    "/api/chat": LOW,
+})
+
+# Per-route latency histograms and in-flight gauges, around admission
+app.add_middleware(MetricsMiddleware)
+
+# Outermost: root trace span per sampled request (TRACE_SAMPLE_RATE, default off)
+app.add_middleware(TracingMiddleware)
 
 # ─── MODELS ──────────────────────────────────────────────────────────────────
 
@@ -31,6 +129,11 @@ class WeatherRequest(BaseModel):
     location: str
     language: str = "english"
 
+class CoordsWeatherRequest(BaseModel):
+    lat: float = Field(ge=-90, le=90)
+    lon: float = Field(ge=-180, le=180)
+    language: str = "english"
+
 class CropRequest(BaseModel):
     location: str
     temperature: float
@@ -45,6 +148,42 @@ class CropSelectRequest(BaseModel):
     language: str = "english"
     area_hectares: float = 1.0
 
+class PortfolioRequest(BaseModel):
+    area_hectares: float = Field(gt=0, le=10000, allow_inf_nan=False)
+    budget: float = Field(ge=0, allow_inf_nan=False)  # rupees
+    temperature: float
+    rainfall: float
+    soil_type: str
+    water_level: str
+    water_budget_m3: Optional[float] = Field(default=None, ge=0, allow_inf_nan=False)  # irrigation, whole farm
+    max_share: float = Field(default=1.0, gt=0, le=1)  # of the area, per crop
+    language: str = "english"
+
+class GridAxis(BaseModel):
+    min: float = Field(allow_inf_nan=False)
+    max: float = Field(allow_inf_nan=False)
+    steps: int = Field(ge=1, le=1000)
+
+    @model_validator(mode="after")
+    def ascending(self):
+        if self.max < self.min:
+            raise ValueError("max must not be below min")
+        return self
+
+class SuitabilityGridRequest(BaseModel):
+    soil_type: str
+    water_level: str
+    temperature: GridAxis
+    rainfall: GridAxis
+    crops: Optional[List[str]] = Field(None, min_length=1)  # omitted: every crop, in catalogue order
+
+class OnboardRequest(BaseModel):
+    location: str
+    soil_type: str
+    water_level: str
+    language: str = "english"
+    stream: bool = False
+
 class ChatRequest(BaseModel):
     message: str
     language: str = "english"
@@ -95,32 +234,178 @@ TRANSLATIONS = {
     }
 }
 
+# ─── PRECOMPRESSED PAYLOADS ──────────────────────────────────────────────────
+# Static page, translations and default-area guidance are encoded to
+# gzip/brotli once. Guidance is built only for GUIDANCE_PRELOAD_LANGUAGES,
+# so this dict stays a fixed size; other languages are served from the
+# catalogue's bounded text cache and compressed per response. Guidance keys
+# carry the catalogue version they were built from (see CATALOGUE RELOAD).
+GUIDANCE_PRELOAD_LANGUAGES = [lang.strip() for lang in
+                              os.getenv("GUIDANCE_PRELOAD_LANGUAGES", "english,hindi,marathi").split(",")]
+
+def build_guidance(catalogue, languages) -> dict:
+    payloads = {}
+    for lang in languages:
+        if lang in catalogue.languages:
+            for crop_key in catalogue.keys:
+                payloads[("guidance", catalogue.version, crop_key, lang)] = Precompressed.from_json(
+                    get_crop_guidance(crop_key, lang, 1.0, catalogue))
+    return payloads
+
+def build_precompressed() -> dict:
+    payloads = {
+        "index": Precompressed.from_file(os.path.join(FRONTEND_DIR, "index.html"), "text/html; charset=utf-8"),
+    }
+    for lang in TRANSLATIONS:
+        payloads[("translations", lang)] = Precompressed.from_json(
+            {"language": lang, "translations": TRANSLATIONS[lang]})
+    payloads.update(build_guidance(current_catalogue(), GUIDANCE_PRELOAD_LANGUAGES))
+    return payloads
+
+def preload(app: FastAPI):
+    """Build all read-only payloads up front (serve.py calls this before forking)"""
+    app.state.bundles = None
+    with step("precompress payloads"):
+        app.state.precompressed = build_precompressed()
+    with step("translation bundles"):
+        get_bundles(app)
+    app.state.preloaded = True
+
+# ─── CATALOGUE RELOAD ────────────────────────────────────────────────────────
+# Edits to data/catalogue (a seed variety, a market price) go live without a
+# restart. The new catalogue is validated, compiled and opened in a thread,
+# its guidance payloads and bundles are built against it, and only then is
+# it swapped in, together with them. Requests read the catalogue once, so
+# in-flight ones finish on the old version; the recommendation cache is
+# keyed by version and simply stops matching.
+# Every worker checks every CATALOGUE_WATCH_INTERVAL seconds (0 disables),
+# which also picks up an artifact rebuilt by another worker's
+# /admin/catalogue/reload.
+CATALOGUE_WATCH_INTERVAL = float(os.getenv("CATALOGUE_WATCH_INTERVAL", "30"))
+_catalogue_reload_lock = asyncio.Lock()
+
+def catalogue_status(catalogue) -> dict:
+    return {"version": catalogue.version, "source_hash": catalogue.source_hash, "crops": len(catalogue)}
+
+async def reload_catalogue(app: FastAPI, force: bool = False) -> dict:
+    """
+    Swap in the catalogue from data/catalogue if it changed (recompiling
+    regardless with force). Raises ValueError if the data files are invalid;
+    the current catalogue keeps serving.
+    """
+    async with _catalogue_reload_lock:
+        old = current_catalogue()
+        try:
+            new = await run_in_threadpool(refresh_catalogue, old, force=force)
+        except ValueError:
+            CATALOGUE_RELOADS.inc("invalid")
+            raise
+        if new is None:
+            CATALOGUE_RELOADS.inc("unchanged")
+            return {"reloaded": False, **catalogue_status(old)}
+
+        # Build against the version set_catalogue will assign
+        new.version = old.version + 1
+        guidance = await run_in_threadpool(build_guidance, new, GUIDANCE_PRELOAD_LANGUAGES)
+        bundles = await run_in_threadpool(compile_bundles, TRANSLATIONS, new)
+
+        set_catalogue(new)
+        app.state.precompressed = {**{key: payload for key, payload in app.state.precompressed.items()
+                                      if key[0] != "guidance"}, **guidance}
+        app.state.bundles = {**bundles, "catalogue_version": new.version}
+        CATALOGUE_RELOADS.inc("reloaded")
+        print(f"🌱 Crop catalogue v{new.version} loaded ({len(new)} crops, {new.source_hash})")
+        return {"reloaded": True, **catalogue_status(new)}
+
+async def run_catalogue_watcher(app: FastAPI):
+    """Background loop started by the app lifespan"""
+    if CATALOGUE_WATCH_INTERVAL <= 0:
+        return
+    last_error = None
+    while True:
+        await asyncio.sleep(CATALOGUE_WATCH_INTERVAL)
+        try:
+            await reload_catalogue(app)
+            last_error = None
+        except Exception as e:
+            if str(e) != last_error:  # report a broken edit once, not every interval
+                print(f"⚠️ Crop catalogue reload failed: {e}")
+            last_error = str(e)
+
+def _location_not_found(language: str) -> str:
+    return TRANSLATIONS.get(language.lower(), TRANSLATIONS["english"])["location_not_found"]
+
 # ─── ROUTES ──────────────────────────────────────────────────────────────────
+# Routes are async: upstream calls are awaited, SQLite writes go to the
+# threadpool, and CPU-trivial work (lookups, scoring 5 crops) runs inline.
+# Hot routes validate the raw body with json_body() and return
+# FastJSONResponse directly, bypassing jsonable_encoder.
+
+def get_bundles(app: FastAPI) -> dict:
+    """Compiled bundles for the current catalogue, built on first use if warm-up hasn't got there yet"""
+    catalogue = current_catalogue()
+    bundles = app.state.bundles
+    if bundles is None or bundles["catalogue_version"] != catalogue.version:
+        bundles = app.state.bundles = {**compile_bundles(TRANSLATIONS, catalogue),
+                                       "catalogue_version": catalogue.version}
+    return bundles
 
 @app.get("/")
-def root():
-    return FileResponse(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../frontend/index.html"))
+async def root(request: Request):
+    index = request.app.state.precompressed.get("index")
+    if index is None:
+        return FileResponse(os.path.join(FRONTEND_DIR, "index.html"))
+    return index.response(request.headers)
 
 @app.get("/api/translations/{language}")
-def get_translations(language: str):
+async def get_translations(language: str, request: Request):
     lang = language.lower()
     if lang not in TRANSLATIONS:
         lang = "english"
-    return {"language": lang, "translations": TRANSLATIONS[lang]}
+    cached = request.app.state.precompressed.get(("translations", lang))
+    if cached is None:
+        return FastJSONResponse({"language": lang, "translations": TRANSLATIONS[lang]})
+    return cached.response(request.headers)
+
+@app.get("/api/bundles/manifest.json")
+async def bundles_manifest(request: Request):
+    """Current bundle version and URL per language"""
+    return get_bundles(request.app)["manifest"].response(request.headers)
+
+@app.get("/api/bundles/{bundle_name}")
+async def get_bundle(bundle_name: str, request: Request):
+    """Immutable translations + crop names bundle, e.g. /api/bundles/hindi.<version>.json"""
+    lang, _, version = bundle_name.removesuffix(".json").partition(".")
+    bundles = get_bundles(request.app)["bundles"]
+    if lang.lower() not in bundles:
+        raise HTTPException(status_code=404, detail="Bundle not found")
+    current, payload = bundles[lang.lower()]
+    if version != current:
+        # Stale or missing version (e.g. after a deploy): point at the current one
+        return RedirectResponse(bundle_url(lang.lower(), current), status_code=307,
+                                headers={"Cache-Control": "no-cache"})
+    return payload.response(request.headers)
 
-@app.post("/api/weather")
-def fetch_weather(req: WeatherRequest):
+@app.post("/api/weather", openapi_extra=body_schema(WeatherRequest))
+async def fetch_weather(req: WeatherRequest = json_body(WeatherRequest)):
     """Fetch real weather data for a location"""
-    result = get_weather_by_location(req.location)
+    result = await get_weather_by_location(req.location)
+    if result["success"]:
+        return FastJSONResponse(result)
+    else:
+        raise HTTPException(status_code=404, detail=_location_not_found(req.language))
+
+@app.post("/api/weather/by-coords", openapi_extra=body_schema(CoordsWeatherRequest))
+async def fetch_weather_gps(req: CoordsWeatherRequest = json_body(CoordsWeatherRequest)):
+    """Weather for a GPS fix, served per geocell"""
+    result = await get_weather_by_coords(req.lat, req.lon)
     if result["success"]:
-        return result
+        return FastJSONResponse(result)
     else:
-        lang = req.language.lower()
-        msg = TRANSLATIONS.get(lang, TRANSLATIONS["english"])["location_not_found"]
-        raise HTTPException(status_code=404, detail=msg)
+        raise HTTPException(status_code=404, detail=_location_not_found(req.language))
 
-@app.post("/api/recommend-crops")
-def recommend(req: CropRequest):
+@app.post("/api/recommend-crops", openapi_extra=body_schema(CropRequest))
+async def recommend(req: CropRequest = json_body(CropRequest)):
     """AI crop recommendation based on field data"""
     crops = recommend_crops(
         soil_type=req.soil_type,
@@ -139,28 +424,216 @@ def recommend(req: CropRequest):
         "water_level": req.water_level,
         "recommended_crops": [c["key"] for c in crops]
     }
-    session_id = save_session(session_data)
+    session_id = await run_in_threadpool(save_session, session_data)
+    return FastJSONResponse({"session_id": session_id, "crops": crops})
+
+# Streamed onboarding waits this long for weather before sending provisional
+# recommendations built from the regional estimate.
+ONBOARD_WEATHER_DEADLINE = float(os.getenv("ONBOARD_WEATHER_DEADLINE", "1.5"))
+
+async def _onboard_recommend(req: OnboardRequest, weather: dict) -> dict:
+    """Score crops for resolved weather and save the session"""
+    crops = recommend_crops(
+        soil_type=req.soil_type,
+        temperature=weather["temperature"],
+        rainfall=weather["rainfall_annual_mm"],
+        humidity=weather["humidity"],
+        water_level=req.water_level,
+        language=req.language
+    )
+    session_id = await run_in_threadpool(save_session, {
+        "location": weather["location"],
+        "temperature": weather["temperature"],
+        "rainfall": weather["rainfall_annual_mm"],
+        "soil_type": req.soil_type,
+        "water_level": req.water_level,
+        "recommended_crops": [c["key"] for c in crops],
+        "language": req.language.lower()
+    })
     return {"session_id": session_id, "crops": crops}
 
-@app.post("/api/crop-guidance")
-def crop_guidance(req: CropSelectRequest):
+async def _onboard_stream(req: OnboardRequest, weather_task: asyncio.Task):
+    """
+    NDJSON sections: optional "provisional" crops if weather misses the
+    deadline, then "weather" and "recommendations" (or "error").
+    """
+    done, _ = await asyncio.wait({weather_task}, timeout=ONBOARD_WEATHER_DEADLINE)
+    if not done:
+        estimate = get_demo_weather(req.location)
+        crops = recommend_crops(req.soil_type, estimate["temperature"], estimate["rainfall_annual_mm"],
+                                estimate["humidity"], req.water_level, req.language)
+        yield dumps({"section": "provisional", "crops": crops}) + b"\n"
+
+    weather = await weather_task
+    if not weather["success"]:
+        yield dumps({"section": "error", "detail": _location_not_found(req.language)}) + b"\n"
+        return
+    yield dumps({"section": "weather", "weather": weather}) + b"\n"
+    yield dumps({"section": "recommendations", **await _onboard_recommend(req, weather)}) + b"\n"
+
+@app.post("/api/onboard", openapi_extra=body_schema(OnboardRequest))
+async def onboard(req: OnboardRequest = json_body(OnboardRequest)):
+    """Weather + crop recommendation + session save in one round trip"""
+    weather_task = asyncio.create_task(get_weather_by_location(req.location))
+    if req.stream:
+        return StreamingResponse(_onboard_stream(req, weather_task), media_type="application/x-ndjson")
+
+    weather = await weather_task
+    if not weather["success"]:
+        raise HTTPException(status_code=404, detail=_location_not_found(req.language))
+    return FastJSONResponse({"weather": weather, **await _onboard_recommend(req, weather)})
+
+@app.post("/api/crop-guidance", openapi_extra=body_schema(CropSelectRequest))
+async def crop_guidance(request: Request, req: CropSelectRequest = json_body(CropSelectRequest)):
     """Get detailed guidance for selected crop"""
-    guidance = get_crop_guidance(req.crop_key, req.language, req.area_hectares)
+    catalogue = current_catalogue()
+    key = ("guidance", catalogue.version, req.crop_key, req.language.lower())
+    cached = request.app.state.precompressed.get(key)
+    if cached and req.area_hectares == 1.0:
+        return cached.response(request.headers)
+    guidance = get_crop_guidance(req.crop_key, req.language, req.area_hectares, catalogue)
     if not guidance:
         raise HTTPException(status_code=404, detail="Crop not found")
-    return guidance
+    return FastJSONResponse(guidance)
+
+@app.post("/api/portfolio", openapi_extra=body_schema(PortfolioRequest))
+async def crop_portfolio(req: PortfolioRequest = json_body(PortfolioRequest)):
+    """Split the farm across crops for the best expected profit within budget and water"""
+    plan = await run_in_threadpool(
+        optimize_portfolio, req.area_hectares, req.budget, req.soil_type, req.temperature, req.rainfall,
+        req.water_level, req.water_budget_m3, req.max_share, req.language)
+    return FastJSONResponse(plan)
+
+# 200 x 200 temperature/rainfall points over 500 crops
+SUITABILITY_GRID_MAX_CELLS = int(os.getenv("SUITABILITY_GRID_MAX_CELLS", "20000000"))
+
+def _grid_payload(keys: list, req: SuitabilityGridRequest, catalogue, encoding: str) -> bytes:
+    payload = suitability_grid(keys, req.soil_type, req.water_level,
+                               grid_axis(req.temperature.min, req.temperature.max, req.temperature.steps),
+                               grid_axis(req.rainfall.min, req.rainfall.max, req.rainfall.steps), catalogue)
+    return compress(payload, encoding)
+
+@app.post("/api/suitability-grid", openapi_extra=body_schema(SuitabilityGridRequest))
+async def suitability_grid_sweep(request: Request, req: SuitabilityGridRequest = json_body(SuitabilityGridRequest)):
+    """
+    Crop scores over a temperature x rainfall grid, as a binary AGROGRID
+    payload of uint8 scores (see crop_engine.suitability_grid)
+    """
+    catalogue = current_catalogue()
+    keys = catalogue.keys if req.crops is None else req.crops
+    unknown = [key for key in keys if key not in catalogue.index]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown crops: {', '.join(unknown[:10])}")
+    if len(keys) * req.temperature.steps * req.rainfall.steps > SUITABILITY_GRID_MAX_CELLS:
+        raise HTTPException(status_code=400, detail=f"Grid larger than {SUITABILITY_GRID_MAX_CELLS:,} cells")
+
+    # Encoded off the event loop here rather than by CompressionMiddleware:
+    # the raw surface is 1 byte per cell and compresses several hundredfold
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    body = await run_in_threadpool(_grid_payload, keys, req, catalogue, encoding)
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="application/octet-stream", headers=headers)
 
 @app.post("/api/chat")
-def chat(req: ChatRequest):
+async def chat(req: ChatRequest):
     """AI chat with farmer in their language"""
-    response = chat_with_farmer(
+    response = await chat_with_farmer(
         message=req.message,
         language=req.language,
         context=req.context,
         history=req.history
     )
-    return {"reply": response}
+    return FastJSONResponse({"reply": response})
+
+@on_shed("/api/chat")
+async def chat_degraded(request: Request):
+    """Rule-based reply when chat is shed under load"""
+    try:
+        req = ChatRequest.model_validate_json(await request.body())
+    except ValueError:
+        return None
+    reply = get_rule_based_response(req.message, req.language.lower(), req.context)
+    return FastJSONResponse({"reply": reply, "degraded": True})
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(render_latest(), media_type="text/plain; version=0.0.4")
+
+# ─── ADMIN ───────────────────────────────────────────────────────────────────
+# Profiling and catalogue endpoints, disabled unless ADMIN_TOKEN is set. Callers send
+# "Authorization: Bearer <ADMIN_TOKEN>".
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+def require_admin(request: Request):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+    if not secrets.compare_digest(supplied.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@app.post("/admin/profile/start", dependencies=[Depends(require_admin)])
+async def profile_start(seconds: float = 30, interval_ms: float = 5, include_idle: bool = False):
+    """Start the sampling profiler; it stops by itself after `seconds`"""
+    if not profiler.start(seconds, interval_ms, include_idle):
+        raise HTTPException(status_code=409, detail="Profiler already running")
+    return {"running": True, "seconds": seconds, "interval_ms": interval_ms}
+
+@app.post("/admin/profile/stop", dependencies=[Depends(require_admin)])
+async def profile_stop():
+    """Stop the profiler and return collapsed stacks (flamegraph.pl / speedscope input)"""
+    stacks = await run_in_threadpool(profiler.stop)
+    return PlainTextResponse(stacks, headers={"X-Profile-Samples": str(profiler.samples)})
+
+@app.post("/admin/profile", dependencies=[Depends(require_admin)])
+async def profile_for(seconds: float = 10, interval_ms: float = 5, include_idle: bool = False):
+    """Profile for `seconds` and return collapsed stacks in one call"""
+    if not profiler.start(seconds, interval_ms, include_idle):
+        raise HTTPException(status_code=409, detail="Profiler already running")
+    while profiler.running:
+        await asyncio.sleep(0.1)
+    return PlainTextResponse(profiler.collapsed(), headers={"X-Profile-Samples": str(profiler.samples)})
+
+@app.post("/admin/memory/baseline", dependencies=[Depends(require_admin)])
+async def memory_baseline(frames: int = 10):
+    """Start tracemalloc (if needed) and record the baseline snapshot"""
+    return await run_in_threadpool(allocations.set_baseline, frames)
+
+@app.get("/admin/memory/top", dependencies=[Depends(require_admin)])
+async def memory_top(limit: int = 25, key_type: str = "lineno"):
+    """Top allocation sites, diffed against the baseline when one is set"""
+    if key_type not in ("lineno", "filename", "traceback"):
+        raise HTTPException(status_code=400, detail="key_type must be lineno, filename or traceback")
+    return await run_in_threadpool(allocations.top, limit, key_type)
+
+@app.post("/admin/memory/stop", dependencies=[Depends(require_admin)])
+async def memory_stop():
+    """Stop tracemalloc and drop the baseline"""
+    allocations.stop()
+    return {"tracing": False}
+
+@app.post("/admin/catalogue/reload", dependencies=[Depends(require_admin)])
+async def catalogue_reload(request: Request):
+    """Recompile data/catalogue and swap it in; 422 listing the problems if it is invalid"""
+    try:
+        return await reload_catalogue(request.app, force=True)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e).splitlines())
+
+@app.get("/admin/catalogue", dependencies=[Depends(require_admin)])
+async def catalogue_info():
+    """Version and source hash of the catalogue being served"""
+    return catalogue_status(current_catalogue())
+
+@app.get("/api/ready")
+async def ready():
+    """Readiness probe: 503 until background warm-up completes, with startup timings"""
+    report = startup.report()
+    return FastJSONResponse(report, status_code=200 if report["ready"] else 503)
 
 @app.get("/api/health")
-def health():
+async def health():
     return {"status": "AgroNova API is running! 🌱"}
@@ -0,0 +1,292 @@
+"""
+Minimal Prometheus-style metrics (text exposition format 0.0.4).
+
+Recording is lock-free on the hot path: each thread writes into its own
+shard (the event loop thread and every threadpool worker get one), and
+shards are only summed when /metrics is scraped. A lock is taken once per
+thread per metric, the first time that thread records.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._reset()
+        _registry.append(self)
+
+    def _reset(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _merged(self) -> dict:
+        raise NotImplementedError
+
+    def render(self) -> list:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1.0):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def _merged(self) -> dict:
+        totals = {}
+        for shard in list(self._shards):
+            for labels, value in shard.copy().items():
+                totals[labels] = totals.get(labels, 0.0) + value
+        return totals
+
+    def value(self, *labels) -> float:
+        return self._merged().get(labels, 0.0)
+
+    def render(self) -> list:
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {v}"
+                for k, v in sorted(self._merged().items())]
+
+
+class Gauge(Counter):
+    """
+    inc()/dec() are sharded like a Counter; set() records an absolute value
+    and set_function() reads one at scrape time (for sizes, budgets, etc).
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+        self._functions = {}
+
+    def dec(self, *labels, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float):
+        self._values[labels] = value
+
+    def set_function(self, *labels, fn):
+        self._functions[labels] = fn
+
+    def _merged(self) -> dict:
+        totals = super()._merged()
+        for labels, value in self._values.copy().items():
+            totals[labels] = totals.get(labels, 0.0) + value
+        for labels, fn in self._functions.copy().items():
+            totals[labels] = totals.get(labels, 0.0) + fn()
+        return totals
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (),
+                 buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels):
+        shard = self._shard()
+        counts = shard.get(labels)
+        if counts is None:
+            # per-bucket counts, +Inf bucket, then sum
+            counts = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def time(self, *labels) -> "_Timer":
+        return _Timer(self, labels)
+
+    def _merged(self) -> dict:
+        totals = {}
+        for shard in list(self._shards):
+            for labels, counts in shard.copy().items():
+                merged = totals.setdefault(labels, [0] * len(counts))
+                for i, c in enumerate(counts):
+                    merged[i] += c
+        return totals
+
+    def render(self) -> list:
+        lines = []
+        for labels, counts in sorted(self._merged().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {counts[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+
+def render_latest() -> str:
+    """Render every registered metric in Prometheus text format"""
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _reset_after_fork():
+    # A forked worker starts from zero instead of re-reporting the parent's samples
+    for metric in _registry:
+        metric._reset()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# ─── APPLICATION METRICS ──────────────────────────────────────────────────────
+
+REQUEST_DURATION = Histogram(
+    "agronova_http_request_duration_seconds", "HTTP request latency by route",
+    ("method", "route", "status"))
+REQUESTS_IN_FLIGHT = Gauge(
+    "agronova_http_requests_in_flight", "HTTP requests currently being served",
+    ("method", "route"))
+UPSTREAM_DURATION = Histogram(
+    "agronova_upstream_request_duration_seconds", "Upstream API call latency by outcome",
+    ("upstream", "outcome"))
+UPSTREAM_QUOTA_REMAINING = Gauge(
+    "agronova_upstream_quota_remaining", "Upstream API calls available right now (token bucket)",
+    ("upstream",))
+UPSTREAM_QUOTA_DENIED = Counter(
+    "agronova_upstream_quota_denied_total", "Upstream calls skipped for lack of quota by priority",
+    ("upstream", "priority"))
+DB_DURATION = Histogram(
+    "agronova_db_operation_duration_seconds", "SQLite operation latency",
+    ("operation",))
+RECOMMEND_CACHE = Counter(
+    "agronova_recommend_cache_lookups_total", "Recommendation cache lookups by result (hit, miss, stale)",
+    ("result",))
+RECOMMEND_CACHE_ENTRIES = Gauge(
+    "agronova_recommend_cache_entries", "Entries in the recommendation cache")
+CATALOGUE_TEXT_LOADS = Counter(
+    "agronova_catalogue_text_loads_total", "Crop guidance text sections decoded by language",
+    ("language",))
+CATALOGUE_TEXT_LANGUAGES = Gauge(
+    "agronova_catalogue_text_languages", "Languages whose crop guidance text is held in memory")
+CATALOGUE_VERSION = Gauge(
+    "agronova_catalogue_version", "Version of the crop catalogue being served (bumped on each reload)")
+CATALOGUE_RELOADS = Counter(
+    "agronova_catalogue_reloads_total", "Crop catalogue reload checks by result (reloaded, unchanged, invalid)",
+    ("result",))
+WEATHER_CACHE = Counter(
+    "agronova_weather_cache_lookups_total", "Weather cache lookups by result (snapshot, fresh, stale, miss)",
+    ("result",))
+GEOCODE_LOOKUPS = Counter(
+    "agronova_geocode_lookups_total", "Place-name geocode cache lookups by result (hit, negative, miss)",
+    ("result",))
+WEATHER_PREFETCH = Counter(
+    "agronova_weather_prefetch_total", "Upstream refreshes made ahead of expiry for hot locations")
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "agronova_admission_queue_depth", "Requests waiting for an admission slot by priority class",
+    ("priority_class",))
+ADMISSION_IN_FLIGHT = Gauge(
+    "agronova_admission_in_flight", "Admitted requests being served by priority class",
+    ("priority_class",))
+ADMISSION_QUEUE_SECONDS = Histogram(
+    "agronova_admission_queue_seconds", "Time spent waiting for admission by priority class",
+    ("priority_class",))
+ADMISSION_SHED = Counter(
+    "agronova_admission_shed_total", "Requests shed under load by priority class and action (rejected, degraded)",
+    ("priority_class", "action"))
+
+
+# ─── MIDDLEWARE ───────────────────────────────────────────────────────────────
+
+class MetricsMiddleware:
+    """
+    Records latency and in-flight requests per route template (e.g.
+    /api/bundles/{bundle_name}), so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_cache = {}
+
+    def _route_template(self, scope) -> str:
+        key = (scope["method"], scope["path"])
+        template = self._route_cache.get(key)
+        if template is None:
+            template = "unmatched"
+            for route in scope["app"].router.routes:
+                match, _ = route.matches(scope)
+                if match.name == "FULL":
+                    template = route.path
+                    break
+            if len(self._route_cache) < 4096:
+                self._route_cache[key] = template
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_template(scope)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc(method, route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_DURATION.observe(time.perf_counter() - start, method, route, str(status))
+            REQUESTS_IN_FLIGHT.dec(method, route)
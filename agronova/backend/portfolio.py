@@ -0,0 +1,206 @@
+"""
+Whole-farm crop portfolio: how to split a farm's land across crops.
+
+Hectares x_c per crop maximize expected profit
+
+    sum((revenue_per_ha_c * score_c / 100 - cost_per_ha_c) * x_c)
+
+subject to
+
+    sum(x_c)                  <= area          (the rest stays fallow)
+    sum(cost_per_ha_c * x_c)  <= budget        (rupees)
+    sum(irrigation_c * x_c)   <= water budget  (m³, when given)
+    0 <= x_c <= max_share * area
+
+revenue_per_ha is yield_per_ha x price, as in the guidance calculator,
+scaled by the crop's suitability score for the field so a poor fit
+counts for less. irrigation_c is the rainfall shortfall below the crop's
+rain_min, in m³ per hectare (1 mm over 1 ha = 10 m³). Crops scoring under
+PORTFOLIO_MIN_SCORE are left out.
+
+With a handful of coupling rows the LP is solved exactly by a small
+bounded-variable simplex (per-crop caps are bounds, not rows), in a few
+milliseconds for 500 crops. The per-crop coefficient arrays depend only on
+the catalogue and are built once per catalogue version.
+"""
+import os
+from array import array
+
+from catalogue import Catalogue
+from crop_engine import current_catalogue, normalize_soil, normalize_water, score_crop
+from tracing import traced
+
+PORTFOLIO_MIN_SCORE = int(os.getenv("PORTFOLIO_MIN_SCORE", "50"))
+
+INF = float("inf")
+EPS = 1e-9
+M3_PER_MM_HA = 10.0
+
+
+# ─── LP SOLVER ────────────────────────────────────────────────────────────────
+
+def maximize(objective: list, rows: list, limits: list, upper: list) -> tuple:
+    """
+    Maximize objective·x subject to rows[k]·x <= limits[k] (limits >= 0)
+    and 0 <= x <= upper, by the bounded-variable simplex method on a dense
+    tableau. Returns (x, slack of each row).
+    """
+    n, m = len(objective), len(rows)
+    # Columns: n structural variables, then one slack per row (the starting basis)
+    tableau = [[float(a) for a in row] + [1.0 if k == i else 0.0 for k in range(m)] for i, row in enumerate(rows)]
+    bound = [float(u) for u in upper] + [INF] * m
+    reduced = [float(c) for c in objective] + [0.0] * m
+    basis = list(range(n, n + m))
+    value = [float(b) for b in limits]  # of each row's basic variable
+    at_upper = [False] * (n + m)
+    degenerate = False
+
+    for _ in range(50 * (n + m)):
+        # Entering: the largest improvement, or the first one after a degenerate
+        # step (Bland's rule), which rules out cycling
+        entering, best = -1, EPS
+        for k, d in enumerate(reduced):
+            gain = -d if at_upper[k] else d
+            if gain > best:
+                entering, best = k, gain
+                if degenerate:
+                    break
+        if entering < 0:
+            break
+
+        # Ratio test: how far can it move before it or a basic variable hits a bound
+        direction = -1.0 if at_upper[entering] else 1.0
+        step, leaving, leaves_at_upper = bound[entering], -1, False
+        rates = [-direction * row[entering] for row in tableau]
+        for i, rate in enumerate(rates):
+            if rate < -EPS:
+                limit, at_top = value[i] / -rate, False
+            elif rate > EPS and bound[basis[i]] < INF:
+                limit, at_top = (bound[basis[i]] - value[i]) / rate, True
+            else:
+                continue
+            if limit < step - EPS or (limit <= step + EPS and leaving >= 0 and basis[i] < basis[leaving]):
+                step, leaving, leaves_at_upper = max(limit, 0.0), i, at_top
+        if step == INF:
+            raise ValueError("Portfolio LP is unbounded")
+        degenerate = step <= EPS
+
+        for i, rate in enumerate(rates):
+            value[i] += step * rate
+        if leaving < 0:
+            at_upper[entering] = not at_upper[entering]  # moved to its other bound
+            continue
+
+        at_upper[basis[leaving]] = leaves_at_upper
+        value[leaving] = step if direction > 0 else bound[entering] - step
+        basis[leaving], at_upper[entering] = entering, False
+        pivot = tableau[leaving][entering]
+        pivot_row = tableau[leaving] = [a / pivot for a in tableau[leaving]]
+        for i, row in enumerate(tableau):
+            factor = row[entering]
+            if i != leaving and factor:
+                tableau[i] = [a - factor * b for a, b in zip(row, pivot_row)]
+        factor = reduced[entering]
+        reduced = [a - factor * b for a, b in zip(reduced, pivot_row)]
+
+    x = [bound[k] if at_upper[k] else 0.0 for k in range(n + m)]
+    for i, k in enumerate(basis):
+        x[k] = max(value[i], 0.0)
+    return x[:n], x[n:]
+
+
+# ─── COEFFICIENTS ─────────────────────────────────────────────────────────────
+# Per-crop arrays that depend only on the catalogue, built once per
+# catalogue snapshot: a reload (crop_engine.set_catalogue) installs a new
+# one, so what-ifs against the same catalogue only pay for scoring.
+_coefficients = (None, None)  # (catalogue, {name: array})
+
+def coefficients(catalogue: Catalogue) -> dict:
+    global _coefficients
+    cached_for, arrays = _coefficients
+    if cached_for is catalogue:
+        return arrays
+    arrays = {
+        # yield_per_ha is in tonnes; prices are per quintal (10 per tonne)
+        "revenue_per_ha": array("d", (catalogue.yield_per_ha[i] * 10 * catalogue.price_per_quintal[i]
+                                      for i in range(len(catalogue)))),
+        "cost_per_ha": array("d", catalogue.cost_per_ha),
+        "rain_min": array("d", catalogue.rain_min),
+    }
+    _coefficients = (catalogue, arrays)
+    return arrays
+
+
+# ─── OPTIMIZER ────────────────────────────────────────────────────────────────
+
+@traced("optimize_portfolio")
+def optimize_portfolio(area_hectares: float, budget: float, soil_type: str, temperature: float,
+                       rainfall: float, water_level: str, water_budget_m3: float = None,
+                       max_share: float = 1.0, language: str = "english",
+                       catalogue: Catalogue = None) -> dict:
+    """Best split of the farm across crops under the area, budget and water limits"""
+    catalogue = catalogue or current_catalogue()
+    lang = language.lower()
+    if lang not in catalogue.languages:
+        lang = "english"
+    soil_key, water_key = normalize_soil(soil_type), normalize_water(water_level)
+    arrays = coefficients(catalogue)
+    revenue_per_ha, cost_per_ha, rain_min = arrays["revenue_per_ha"], arrays["cost_per_ha"], arrays["rain_min"]
+
+    # Candidates: suitable crops that are expected to make money at all
+    candidates, profit_per_ha, scores = [], [], {}
+    for i in range(len(catalogue)):
+        score = score_crop(catalogue, i, soil_key, temperature, rainfall, water_key)
+        profit = revenue_per_ha[i] * score / 100 - cost_per_ha[i]
+        if score >= PORTFOLIO_MIN_SCORE and profit > 0:
+            candidates.append(i)
+            profit_per_ha.append(profit)
+            scores[i] = score
+    irrigation = [max(rain_min[i] - rainfall, 0.0) * M3_PER_MM_HA for i in candidates]
+
+    rows = [[1.0] * len(candidates), [cost_per_ha[i] for i in candidates]]
+    limits = [area_hectares, budget]
+    names = ["area", "budget"]
+    if water_budget_m3 is not None:
+        rows.append(irrigation)
+        limits.append(water_budget_m3)
+        names.append("water")
+    hectares, slack = maximize(profit_per_ha, rows, limits, [max_share * area_hectares] * len(candidates))
+
+    allocations = []
+    for n, i in enumerate(candidates):
+        if hectares[n] <= 1e-6:
+            continue
+        revenue = revenue_per_ha[i] * scores[i] / 100 * hectares[n]
+        cost = cost_per_ha[i] * hectares[n]
+        allocations.append({
+            "key": catalogue.keys[i],
+            "name": catalogue.name(i, lang),
+            "emoji": catalogue.emoji[i],
+            "score": scores[i],
+            "hectares": round(hectares[n], 2),
+            "cost": round(cost),
+            "expected_revenue": round(revenue),
+            "expected_profit": round(revenue - cost),
+            "water_m3": round(irrigation[n] * hectares[n]),
+        })
+    allocations.sort(key=lambda a: -a["hectares"])
+
+    planted = sum(hectares)
+    total_cost = sum(cost_per_ha[i] * x for i, x in zip(candidates, hectares))
+    total_revenue = sum(revenue_per_ha[i] * scores[i] / 100 * x for i, x in zip(candidates, hectares))
+    return {
+        "allocations": allocations,
+        "totals": {
+            "area_hectares": area_hectares,
+            "planted_hectares": round(planted, 2),
+            "fallow_hectares": round(max(area_hectares - planted, 0.0), 2),
+            "cost": round(total_cost),
+            "expected_revenue": round(total_revenue),
+            "expected_profit": round(total_revenue - total_cost),
+            "water_m3": round(sum(w * x for w, x in zip(irrigation, hectares))),
+        },
+        # Limits the plan runs up against; relaxing these is what would help
+        "binding": [name for name, s, limit in zip(names, slack, limits) if s <= 1e-6 * max(limit, 1.0)],
+        "language": lang,
+    }
@@ -0,0 +1,138 @@
+"""
+On-demand production profiling: a statistical sampling profiler that emits
+flamegraph-ready collapsed stacks, and tracemalloc snapshots diffed against
+a baseline. Driven from the /admin endpoints in main.py.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+MAX_PROFILE_SECONDS = 120
+
+# Leaf functions of threads that are parked, not working — skipped unless
+# the caller asks for idle stacks (event loop select, idle pool workers...)
+IDLE_LEAVES = {"select", "poll", "wait", "_wait_for_tstate_lock", "get", "sleep", "accept"}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples every thread's Python stack with sys._current_frames() from a
+    background thread; the profiled code is not instrumented at all.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.interval = 0.005
+        self.include_idle = False
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, interval_ms: float = 5, include_idle: bool = False) -> bool:
+        """Start sampling for up to `seconds`; False if already running"""
+        with self._lock:
+            if self.running:
+                return False
+            self._stacks = Counter()
+            self.samples = 0
+            self.interval = max(interval_ms, 1) / 1000
+            self.include_idle = include_idle
+            self.started_at = time.time()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(min(seconds, MAX_PROFILE_SECONDS),),
+                name="sampling-profiler", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self) -> str:
+        """Stop sampling (if running) and return the collapsed stacks"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed format: 'root;child;leaf count' per line"""
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def _run(self, seconds: float):
+        own_id = threading.get_ident()
+        names = {}
+        deadline = time.monotonic() + seconds
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if not self.include_idle and frame.f_code.co_name in IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+            self._stop.wait(self.interval)
+
+
+class AllocationTracker:
+    """tracemalloc wrapper: set a baseline, then report top growth sites"""
+
+    def __init__(self):
+        self.baseline = None
+
+    def set_baseline(self, frames: int = 10) -> dict:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.baseline = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        return {"tracing": True, "traced_bytes": current, "peak_bytes": peak}
+
+    def top(self, limit: int = 25, key_type: str = "lineno") -> dict:
+        if not tracemalloc.is_tracing():
+            return {"tracing": False, "sites": []}
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        if self.baseline is not None:
+            stats = snapshot.compare_to(self.baseline, key_type)
+            sites = [{
+                "site": str(s.traceback[0]),
+                "size_bytes": s.size,
+                "size_diff_bytes": s.size_diff,
+                "count": s.count,
+                "count_diff": s.count_diff,
+            } for s in stats[:limit]]
+        else:
+            sites = [{"site": str(s.traceback[0]), "size_bytes": s.size, "count": s.count}
+                     for s in snapshot.statistics(key_type)[:limit]]
+        current, peak = tracemalloc.get_traced_memory()
+        return {"tracing": True, "diffed": self.baseline is not None,
+                "traced_bytes": current, "peak_bytes": peak, "sites": sites}
+
+    def stop(self):
+        self.baseline = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+profiler = SamplingProfiler()
+allocations = AllocationTracker()
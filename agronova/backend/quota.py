@@ -0,0 +1,67 @@
+"""
+Token-bucket quota for a rate-limited upstream API key.
+
+Taking a token never waits: callers that get none fall back (to a cached
+or estimated answer) instead of queuing behind the provider's limit.
+Background work (prefetch, stale refreshes) may only spend tokens above
+a reserve, so interactive lookups still find budget during a burst.
+
+With `per_minute` set to a process's share, the bucket holds up to
+`burst` tokens (at most per_minute - 1) and refills at per_minute - burst
+tokens a minute. Spending a full bucket and then everything that refills
+in the next 60 seconds adds up to exactly per_minute, so the share holds
+in every 60-second window (for shares of at least 2 a minute).
+
+Buckets are per process, so the plan limit is split up front rather than
+enforced jointly:
+
+    ingest.py       OPENWEATHER_INGEST_CALLS_PER_MINUTE (default: half the plan)
+    each API worker (plan - ingest share) / WEB_CONCURRENCY
+
+serve.py exports WEB_CONCURRENCY to its workers, so --workers is taken
+into account. The shares add up to at most the plan limit even when every
+process spends its whole share in the same minute. Set the ingest share
+to 0 where ingest.py never runs, so the API gets the whole plan.
+"""
+import asyncio
+import threading
+import time
+
+
+def share(per_minute: int, processes: int) -> int:
+    """Calls per minute for each of `processes` splitting `per_minute` (at least 1)"""
+    return max(per_minute // max(processes, 1), 1)
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int, burst: int, background_reserve: float = 0.5):
+        self.capacity = max(1, min(burst, per_minute - 1))
+        self.rate = max(per_minute - self.capacity, 1) / 60  # tokens per second
+        self.reserve = self.capacity * background_reserve
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self, background: bool = False) -> bool:
+        """Take one token if available (background calls keep the reserve intact)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            floor = self.reserve if background else 0
+            if self._tokens - 1 < floor:
+                return False
+            self._tokens -= 1
+            return True
+
+    async def take(self, background: bool = False):
+        """Wait for a token (batch jobs only; request handlers use try_take)"""
+        while not self.try_take(background):
+            await asyncio.sleep(1 / self.rate)
+
+    def remaining(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
@@ -0,0 +1,121 @@
+"""
+Production server: pre-forked uvicorn workers sharing read-only data.
+
+    python serve.py --workers 4 --host 0.0.0.0 --port 10000
+
+The parent binds the port, imports the app and builds every read-only
+structure (crop catalogue, TRANSLATIONS, precompressed payloads, bundles) once,
+then runs gc.freeze() and forks. Workers share those pages copy-on-write
+instead of each holding a private copy, and the frozen objects are never
+touched by a worker's garbage collector, so the pages stay shared.
+
+Per-worker resources are not inherited. database, http_client, metrics
+and tracing reset their module state in os.register_at_fork hooks, and
+each worker's lifespan opens its own SQLite pool and HTTP client.
+
+The parent only supervises: it restarts workers that die and forwards
+SIGTERM/SIGINT so every worker shuts down gracefully.
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+import uvicorn
+
+import startup
+from startup import step
+
+# One worker unless told otherwise: in a container the CPU affinity mask
+# reports the host's cores, not the instance's quota or memory
+DEFAULT_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+RESTART_DELAY = 1.0
+
+
+def bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def preload():
+    """Import the app and build shared read-only data, then freeze it"""
+    with step("import main"):
+        import main
+    main.preload(main.app)
+    gc.collect()
+    gc.freeze()
+    return main.app
+
+
+def spawn(app, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    code = 0
+    try:
+        config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+        uvicorn.Server(config).run(sockets=[sock])
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def supervise(app, sock: socket.socket, workers: int, log_level: str):
+    pids = {spawn(app, sock, log_level) for _ in range(workers)}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while pids:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        pids.discard(pid)
+        if not stopping:
+            print(f"⚠️ Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, restarting")
+            time.sleep(RESTART_DELAY)
+            pids.add(spawn(app, sock, log_level))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgroNova pre-fork server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    sock = bind(args.host, args.port)
+    # Read at import (weather.py): each worker takes its share of the upstream quota
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+    app = preload()
+    print(f"✅ Preloaded in {round((time.perf_counter() - startup.STARTED_AT) * 1000)} ms, "
+          f"starting {args.workers} workers on {args.host}:{args.port}")
+    supervise(app, sock, args.workers, args.log_level)
+    sock.close()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
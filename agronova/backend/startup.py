@@ -0,0 +1,49 @@
+"""
+Cold-start instrumentation and readiness.
+
+main.py wraps its import groups and warm-up steps in step(); the timings
+are reported by /api/ready together with the time since this module was
+first imported (the closest in-process proxy for process start).
+"""
+import time
+from contextlib import contextmanager
+
+STARTED_AT = time.perf_counter()
+
+_steps = []
+_ready_at = None
+_failed = None  # why warm-up failed, if it did
+
+
+@contextmanager
+def step(name: str):
+    """Time one import or init step"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _steps.append((name, time.perf_counter() - start))
+
+
+def mark_ready():
+    global _ready_at
+    _ready_at = time.perf_counter()
+
+
+def mark_failed(error: str):
+    global _failed
+    _failed = error
+
+
+def is_ready() -> bool:
+    return _ready_at is not None
+
+
+def report() -> dict:
+    return {
+        "ready": is_ready(),
+        "error": _failed,
+        "ready_after_ms": round((_ready_at - STARTED_AT) * 1000, 1) if _ready_at else None,
+        "uptime_ms": round((time.perf_counter() - STARTED_AT) * 1000, 1),
+        "steps_ms": {name: round(seconds * 1000, 2) for name, seconds in _steps},
+    }
@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# Tests import the backend's flat modules the way main.py does
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# In-process tests get a throwaway database, never the checked-in agronova.db
+os.environ.setdefault("AGRONOVA_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="agronova-tests-"), "test.db"))
@@ -0,0 +1,179 @@
+"""
+Admission control with a small in-flight limit: freed slots go to the
+highest-priority waiter, a request that waits too long (or finds the queue
+full) is shed with 503 or its on_shed() response, and the slot is released
+however the handler ends: returning, raising or finishing a stream.
+"""
+import asyncio
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+import admission
+from admission import AdmissionController, AdmissionMiddleware, PriorityClass
+
+
+def classes(limit: int = 1, wait_ms: float = 2000, queue: int = 8) -> tuple:
+    return (PriorityClass("test_high", 0, limit=limit, max_wait_ms=wait_ms, max_queue=queue, retry_after=2),
+            PriorityClass("test_low", 2, limit=limit, max_wait_ms=wait_ms, max_queue=queue, retry_after=5))
+
+
+def test_freed_slot_goes_to_the_highest_priority_waiter():
+    high, low = classes()
+
+    async def scenario():
+        controller = AdmissionController(total_limit=1)
+        assert await controller.acquire(low)
+        order = []
+
+        async def wait(cls, label):
+            assert await controller.acquire(cls)
+            order.append(label)
+            controller.release(cls)
+
+        # Low queues first, high after it, yet high is woken first
+        waiters = [asyncio.create_task(wait(low, "low")), asyncio.create_task(wait(high, "high"))]
+        await asyncio.sleep(0.01)
+        assert (low.waiting, high.waiting) == (1, 1)
+        controller.release(low)
+        await asyncio.gather(*waiters)
+        assert order == ["high", "low"]
+        assert controller.in_flight == low.in_flight == high.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+class Harness:
+    """A Starlette app behind AdmissionMiddleware with one slot in total"""
+
+    def __init__(self, cls: PriorityClass):
+        self.cls = cls
+        self.started = asyncio.Event()
+        self.finish = asyncio.Event()
+
+        async def slow(request):
+            self.started.set()
+            await self.finish.wait()
+            return JSONResponse({"ok": True})
+
+        async def fail(request):
+            raise RuntimeError("handler failed")
+
+        async def stream(request):
+            async def chunks():
+                yield b"first\n"
+                self.started.set()
+                await self.finish.wait()
+                yield b"last\n"
+            return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+        routes = [Route("/slow", slow), Route("/fail", fail), Route("/stream", stream)]
+        self.controller = AdmissionController(total_limit=1)
+        app = AdmissionMiddleware(Starlette(routes=routes), {r.path: cls for r in routes},
+                                  controller=self.controller)
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+                                        base_url="http://test")
+
+    async def occupy(self, path: str = "/slow") -> asyncio.Task:
+        """Start a request that holds the only slot until finish is set"""
+        task = asyncio.create_task(self.client.get(path))
+        await asyncio.wait_for(self.started.wait(), 1)
+        return task
+
+
+def test_queue_timeout_sheds_with_503():
+    _, low = classes(wait_ms=50)
+
+    async def scenario():
+        harness = Harness(low)
+        holder = await harness.occupy()
+        response = await harness.client.get("/slow")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+        harness.finish.set()
+        assert (await holder).status_code == 200
+        assert harness.controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_sheds_at_once():
+    _, low = classes(queue=0)
+
+    async def scenario():
+        harness = Harness(low)
+        holder = await harness.occupy()
+        response = await asyncio.wait_for(harness.client.get("/slow"), 0.5)  # no waiting in line
+        assert response.status_code == 503
+        harness.finish.set()
+        await holder
+
+    asyncio.run(scenario())
+
+
+def test_shed_request_gets_the_degraded_response(monkeypatch):
+    _, low = classes(wait_ms=50)
+
+    async def degraded(request):
+        return JSONResponse({"degraded": True})
+
+    monkeypatch.setitem(admission._degraded, "/slow", degraded)
+
+    async def scenario():
+        harness = Harness(low)
+        holder = await harness.occupy()
+        response = await harness.client.get("/slow")
+        assert response.status_code == 200 and response.json() == {"degraded": True}
+        harness.finish.set()
+        await holder
+
+    asyncio.run(scenario())
+
+
+def test_slot_is_released_when_the_handler_raises():
+    _, low = classes()
+
+    async def scenario():
+        harness = Harness(low)
+        assert (await harness.client.get("/fail")).status_code == 500
+        assert harness.controller.in_flight == low.in_flight == 0
+        harness.finish.set()
+        assert (await harness.client.get("/slow")).status_code == 200
+
+    asyncio.run(scenario())
+
+
+def test_stream_holds_its_slot_until_it_finishes():
+    _, low = classes(wait_ms=50)
+
+    async def scenario():
+        harness = Harness(low)
+        holder = await harness.occupy("/stream")
+        assert harness.controller.in_flight == 1
+        assert (await harness.client.get("/slow")).status_code == 503
+        harness.finish.set()
+        assert (await holder).text == "first\nlast\n"
+        assert harness.controller.in_flight == low.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("path", ["/slow", "/stream"])
+def test_waiter_is_admitted_when_the_slot_frees(path):
+    _, low = classes()
+
+    async def scenario():
+        harness = Harness(low)
+        holder = await harness.occupy(path)
+        waiter = asyncio.create_task(harness.client.get("/fail"))
+        await asyncio.sleep(0.01)
+        assert low.waiting == 1
+        harness.finish.set()
+        await holder
+        assert (await waiter).status_code == 500  # admitted, ran, and released again
+        assert harness.controller.in_flight == low.in_flight == low.waiting == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,148 @@
+"""
+Catalogue sources and hot reload. A data tree that is missing files, or
+holds JSON of the wrong shape, is reported as an invalid catalogue
+(ValueError), never as a crash. A good edit is swapped in as the next
+version, with guidance payloads and bundles rebuilt for it; a bad one
+leaves the current snapshot serving.
+"""
+import asyncio
+import functools
+import json
+import os
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+
+import catalogue
+import crop_engine
+import main
+from catalogue import SOURCES_DIR, read_sources
+
+
+@pytest.fixture
+def sources(tmp_path):
+    directory = tmp_path / "catalogue"
+    shutil.copytree(SOURCES_DIR, directory)
+    return directory
+
+
+def first_crop(directory) -> str:
+    return json.loads((directory / "catalogue.json").read_text(encoding="utf-8"))["crops"][0]
+
+
+def test_sources_are_valid(sources):
+    languages, crops = read_sources(str(sources))
+    assert "english" in languages and crops
+
+
+@pytest.mark.parametrize("content", ["[]", '"x"', "3", "null"])
+@pytest.mark.parametrize("name", ["catalogue.json", "prices.json", "crop"])
+def test_non_object_file_is_invalid(sources, name, content):
+    name = f"crops/{first_crop(sources)}.json" if name == "crop" else name
+    (sources / name).write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError, match=f"{name}: must be a JSON object"):
+        read_sources(str(sources))
+
+
+@pytest.mark.parametrize("index", [{"languages": "english", "crops": []}, {"languages": ["english"], "crops": [1]}])
+def test_wrongly_typed_index_is_invalid(sources, index):
+    (sources / "catalogue.json").write_text(json.dumps(index), encoding="utf-8")
+    with pytest.raises(ValueError, match="catalogue.json: .* must be a list of strings"):
+        read_sources(str(sources))
+
+
+@pytest.mark.parametrize("name", ["prices.json", "catalogue.json"])
+def test_missing_file_is_invalid(sources, name):
+    os.remove(sources / name)
+    with pytest.raises(ValueError, match=f"{name}: unreadable"):
+        read_sources(str(sources))
+
+
+# ─── RELOAD ───────────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def served(sources, tmp_path, monkeypatch):
+    """The app serving a catalogue compiled from a copy of the data tree"""
+    artifact = str(tmp_path / "catalogue.bin")
+    catalogue.build(str(sources), artifact)
+    monkeypatch.setattr(main, "refresh_catalogue",
+                        functools.partial(catalogue.refresh, path=artifact, directory=str(sources)))
+    monkeypatch.setattr(crop_engine, "CATALOGUE", crop_engine.CATALOGUE)  # restored afterwards
+    crop_engine.set_catalogue(catalogue.open_catalogue(artifact))
+    saved = main.app.state._state.copy()
+    main.app.state.precompressed = main.build_precompressed()
+    main.app.state.bundles = None
+    main.get_bundles(main.app)
+    yield sources
+    main.app.state._state.clear()
+    main.app.state._state.update(saved)
+
+
+def set_price(directory, crop_key: str, price: int):
+    prices = json.loads((directory / "prices.json").read_text(encoding="utf-8"))
+    prices["per_quintal"][crop_key] = price
+    (directory / "prices.json").write_text(json.dumps(prices), encoding="utf-8")
+
+
+def guidance_versions() -> set:
+    return {key[1] for key in main.app.state.precompressed if key[0] == "guidance"}
+
+
+def test_unchanged_sources_keep_the_version(served):
+    version = crop_engine.current_catalogue().version
+    assert asyncio.run(main.reload_catalogue(main.app, force=True))["reloaded"] is False
+    assert crop_engine.current_catalogue().version == version
+
+
+def test_good_reload_bumps_the_version_and_rebuilds_payloads(served):
+    old = crop_engine.current_catalogue()
+    key = first_crop(served)
+    set_price(served, key, 9999)
+    status = asyncio.run(main.reload_catalogue(main.app))
+    new = crop_engine.current_catalogue()
+    assert status["reloaded"] and new is not old
+    assert new.version == status["version"] == old.version + 1
+    assert guidance_versions() == {new.version}
+    assert main.app.state.bundles["catalogue_version"] == new.version
+
+    response = TestClient(main.app).post("/api/crop-guidance", json={"crop_key": key, "language": "english"})
+    assert response.json()["calculator"]["price_per_quintal"] == 9999
+
+
+def test_bad_reload_keeps_the_current_snapshot(served, monkeypatch):
+    old, payloads, bundles = crop_engine.current_catalogue(), main.app.state.precompressed, main.app.state.bundles
+    (served / "prices.json").write_text("[]", encoding="utf-8")
+    with pytest.raises(ValueError, match="prices.json"):
+        asyncio.run(main.reload_catalogue(main.app))
+    assert crop_engine.current_catalogue() is old
+    assert main.app.state.precompressed is payloads and main.app.state.bundles is bundles
+
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "test")
+    response = TestClient(main.app).post("/admin/catalogue/reload", headers={"Authorization": "Bearer test"})
+    assert response.status_code == 422
+    assert crop_engine.current_catalogue() is old
+
+
+def test_watcher_survives_a_bad_edit_and_picks_up_the_fix(served, monkeypatch, capsys):
+    monkeypatch.setattr(main, "CATALOGUE_WATCH_INTERVAL", 0.01)
+    old = crop_engine.current_catalogue()
+    key = first_crop(served)
+    good = (served / "prices.json").read_text(encoding="utf-8")
+
+    async def scenario():
+        watcher = asyncio.create_task(main.run_catalogue_watcher(main.app))
+        (served / "prices.json").write_text("[]", encoding="utf-8")
+        await asyncio.sleep(0.2)
+        assert crop_engine.current_catalogue() is old and not watcher.done()
+        (served / "prices.json").write_text(good, encoding="utf-8")
+        set_price(served, key, 7777)
+        for _ in range(100):
+            if crop_engine.current_catalogue() is not old:
+                break
+            await asyncio.sleep(0.02)
+        watcher.cancel()
+
+    asyncio.run(scenario())
+    assert crop_engine.current_catalogue().version == old.version + 1
+    assert capsys.readouterr().out.count("Crop catalogue reload failed") == 1
@@ -0,0 +1,96 @@
+"""
+ingest.py end to end: a pass against the stub OpenWeatherMap upstream
+(bench/stubs.py) writes one weather_snapshots row per district, and a
+second pass skips districts that are still fresh.
+"""
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+
+from conftest import BACKEND_DIR
+
+DISTRICTS = [
+    {"name": "Ahmednagar", "state": "Maharashtra", "lat": 19.09, "lon": 74.74, "aliases": ["Ahilyanagar"]},
+    {"name": "Akola", "state": "Maharashtra", "lat": 20.7, "lon": 77.0, "aliases": []},
+    {"name": "Ludhiana", "state": "Punjab", "lat": 30.9, "lon": 75.85, "aliases": []},
+]
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = {**os.environ, "STUB_WEATHER_LATENCY_MS": "0", "STUB_WEATHER_JITTER_MS": "0"}
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "bench.stubs:app", "--port", str(port),
+                             "--log-level", "warning"], cwd=BACKEND_DIR, env=env)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                httpx.get(f"{url}/data/2.5/weather", params={"lat": 0, "lon": 0})
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        yield url
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def run_ingest(stub_url: str, tmp_path, *args) -> dict:
+    districts = tmp_path / "districts.json"
+    districts.write_text(json.dumps(DISTRICTS), encoding="utf-8")
+    env = {**os.environ, "OPENWEATHER_API_KEY": "stub", "OPENWEATHER_BASE_URL": stub_url,
+           "AGRONOVA_DB_PATH": str(tmp_path / "test.db")}
+    out = subprocess.run([sys.executable, "ingest.py", "--districts", str(districts), *args],
+                         cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=60, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def snapshots(tmp_path) -> dict:
+    with sqlite3.connect(tmp_path / "test.db") as conn:
+        rows = conn.execute("SELECT district, state, names, fetched_at, data FROM weather_snapshots").fetchall()
+    return {row[0]: {"state": row[1], "names": json.loads(row[2]), "fetched_at": row[3],
+                     "data": json.loads(row[4])} for row in rows}
+
+
+def test_ingest_writes_a_snapshot_per_district(stub_url, tmp_path):
+    counts = run_ingest(stub_url, tmp_path)
+    assert counts == {**counts, "districts": 3, "due": 3, "stored": 3, "failed": 0}
+
+    rows = snapshots(tmp_path)
+    assert set(rows) == {"ahmednagar", "akola", "ludhiana"}
+    ahmednagar = rows["ahmednagar"]
+    assert ahmednagar["state"] == "Maharashtra"
+    assert ahmednagar["names"] == ["Ahmednagar", "Ahilyanagar"]
+    data = ahmednagar["data"]
+    assert data["success"] is True
+    # The district is shown, not the stub's nearest "station"
+    assert data["location"] == "Ahmednagar"
+    assert data["district"] == "Ahmednagar"
+    assert isinstance(data["temperature"], (int, float))
+    assert abs(time.time() - ahmednagar["fetched_at"]) < 60
+
+
+def test_ingest_skips_fresh_snapshots(stub_url, tmp_path):
+    run_ingest(stub_url, tmp_path)
+    first = {district: row["fetched_at"] for district, row in snapshots(tmp_path).items()}
+
+    counts = run_ingest(stub_url, tmp_path)
+    assert counts["due"] == 0 and counts["stored"] == 0
+    assert {d: row["fetched_at"] for d, row in snapshots(tmp_path).items()} == first
+
+    counts = run_ingest(stub_url, tmp_path, "--max-age", "0")
+    assert counts["due"] == 3 and counts["stored"] == 3
+    assert all(row["fetched_at"] > first[d] for d, row in snapshots(tmp_path).items())
@@ -0,0 +1,95 @@
+"""
+The portfolio LP: maximize() against an exact textbook simplex on small
+random problems (feasibility, bounds, slack and the optimal objective), and
+optimize_portfolio() keeping to the area, budget and water limits.
+"""
+import random
+from fractions import Fraction
+
+import pytest
+
+from bench.crop_bench import synthetic_catalogue
+from portfolio import maximize, optimize_portfolio
+
+
+def reference(objective, rows, limits) -> float:
+    """Optimal objective of max c·x, Ax <= b (b >= 0), x >= 0, by Bland's rule in exact arithmetic"""
+    m, n = len(rows), len(objective)
+    tableau = [[Fraction(a) for a in row] + [Fraction(int(i == k)) for k in range(m)] + [Fraction(limits[i])]
+               for i, row in enumerate(rows)]
+    reduced = [Fraction(-c) for c in objective] + [Fraction(0)] * (m + 1)
+    basis = list(range(n, n + m))
+    while True:
+        entering = next((k for k in range(n + m) if reduced[k] < 0), None)
+        if entering is None:
+            return float(reduced[-1])
+        _, _, leaving = min((tableau[i][-1] / tableau[i][entering], basis[i], i)
+                            for i in range(m) if tableau[i][entering] > 0)
+        pivot = tableau[leaving][entering]
+        tableau[leaving] = [a / pivot for a in tableau[leaving]]
+        for i in range(m):
+            factor = tableau[i][entering]
+            if i != leaving and factor:
+                tableau[i] = [a - factor * b for a, b in zip(tableau[i], tableau[leaving])]
+        factor = reduced[entering]
+        reduced = [a - factor * b for a, b in zip(reduced, tableau[leaving])]
+        basis[leaving] = entering
+
+
+def random_lp(rng: random.Random) -> tuple:
+    # Small integers and zeros make ties and degenerate pivots common
+    def value():
+        return rng.choice([0, rng.randint(0, 5), round(rng.uniform(0, 10), 2)])
+    n, m = rng.randint(1, 10), rng.randint(1, 3)
+    objective = [rng.choice([rng.randint(-3, 9), round(rng.uniform(-2, 10), 2)]) for _ in range(n)]
+    rows = [[1] * n] + [[value() for _ in range(n)] for _ in range(m - 1)]
+    limits = [rng.choice([0, rng.randint(0, 10), round(rng.uniform(0, 20), 2)]) for _ in range(m)]
+    upper = [rng.choice([rng.randint(0, 6), round(rng.uniform(0, 8), 2), 100]) for _ in range(n)]
+    return objective, rows, limits, upper
+
+
+def test_maximize_matches_exact_simplex():
+    rng = random.Random(5)
+    for _ in range(500):
+        objective, rows, limits, upper = random_lp(rng)
+        x, slack = maximize(objective, rows, limits, upper)
+        for row, limit, s in zip(rows, limits, slack):
+            used = sum(a * v for a, v in zip(row, x))
+            assert used <= limit + 1e-6
+            assert used + s == pytest.approx(limit, abs=1e-6)
+        assert all(-1e-9 <= v <= u + 1e-9 for v, u in zip(x, upper))
+        # The reference has no bounds, so they go in as rows
+        best = reference(objective, rows + [[int(i == j) for i in range(len(x))] for j in range(len(x))],
+                         limits + upper)
+        assert sum(c * v for c, v in zip(objective, x)) == pytest.approx(best, rel=1e-6, abs=1e-6)
+
+
+def test_maximize_unbounded():
+    with pytest.raises(ValueError):
+        maximize([1.0], [[0.0]], [1.0], [float("inf")])
+
+
+@pytest.fixture(scope="module")
+def catalogue():
+    return synthetic_catalogue(100)
+
+
+def test_portfolio_respects_limits(catalogue):
+    # Dry enough that crops need irrigation, so the water limit bites
+    plan = optimize_portfolio(10, 300_000, "loamy", 24, 300, "medium", water_budget_m3=1_000,
+                              max_share=0.4, catalogue=catalogue)
+    totals = plan["totals"]
+    assert plan["allocations"]
+    assert "water" in plan["binding"]
+    assert totals["planted_hectares"] <= 10 + 0.01
+    assert totals["cost"] <= 300_000 + 1
+    assert totals["water_m3"] <= 1_000 + 1
+    assert all(a["hectares"] <= 4 + 0.01 and a["expected_profit"] > 0 for a in plan["allocations"])
+
+
+def test_tighter_budget_binds_and_earns_less(catalogue):
+    loose = optimize_portfolio(10, 10_000_000, "loamy", 24, 900, "medium", catalogue=catalogue)
+    tight = optimize_portfolio(10, 50_000, "loamy", 24, 900, "medium", catalogue=catalogue)
+    assert "budget" not in loose["binding"]
+    assert "budget" in tight["binding"]
+    assert tight["totals"]["expected_profit"] <= loose["totals"]["expected_profit"]
@@ -0,0 +1,30 @@
+"""
+The OpenWeatherMap plan limit split across processes: the shares add up to
+at most the plan, and a bucket never grants more than its share in any
+60-second window.
+"""
+import quota
+from quota import TokenBucket, share
+
+
+def test_shares_add_up_to_at_most_the_plan():
+    for plan in (60, 61, 600):
+        for ingest in (0, plan // 2):
+            for workers in (1, 2, 3, 4, 7):
+                assert ingest + workers * share(plan - ingest, workers) <= plan
+
+
+def test_bucket_holds_its_share_in_every_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(quota.time, "monotonic", lambda: now[0])
+    # Includes shares no bigger than the burst, as with several workers
+    for per_minute, burst in ((15, 10), (10, 10), (4, 10), (2, 10)):
+        bucket = TokenBucket(per_minute, burst)
+        granted = []
+        for tick in range(600):  # ten minutes, a greedy caller every second
+            now[0] += 1
+            while bucket.try_take():
+                granted.append(tick)
+        assert len(granted) >= 10 * (per_minute - bucket.capacity)
+        for start in range(540):
+            assert sum(start <= t < start + 60 for t in granted) <= per_minute
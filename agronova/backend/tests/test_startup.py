@@ -0,0 +1,30 @@
+"""
+Warm-up failure: the error is logged and reported by /api/ready, the
+process is asked to shut down, and it is never marked ready.
+"""
+import asyncio
+import signal
+
+from fastapi.testclient import TestClient
+
+import main
+import startup
+
+
+def test_failed_warm_up_is_reported_and_shuts_down(monkeypatch, capsys):
+    monkeypatch.setattr(startup, "_ready_at", None)
+    monkeypatch.setattr(startup, "_failed", None)
+    kills = []
+    monkeypatch.setattr(main.os, "kill", lambda pid, sig: kills.append((pid, sig)))
+
+    def broken_db():
+        raise OSError("database is locked")
+
+    monkeypatch.setattr(main, "init_db", broken_db)
+    asyncio.run(main.warm_up(main.app))
+
+    assert kills == [(main.os.getpid(), signal.SIGTERM)]
+    assert "OSError: database is locked" in capsys.readouterr().err
+    response = TestClient(main.app).get("/api/ready")
+    assert response.status_code == 503
+    assert response.json()["error"] == "OSError: database is locked"
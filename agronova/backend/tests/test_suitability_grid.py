@@ -0,0 +1,84 @@
+"""
+suitability_grid against score_crop: every cell of the payload must equal
+the score of that crop at that temperature and rainfall, including on the
+band edges, where the bisect cuts are easiest to get wrong. An empty crop
+selection is an error, not "every crop".
+"""
+import json
+import random
+import struct
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bench.crop_bench import synthetic_catalogue
+from crop_engine import GRID_MAGIC, grid_axis, normalize_soil, normalize_water, score_crop, suitability_grid
+from main import app
+
+SOILS = ["loamy", "clay", "sandy", "silty", "black", "काली"]
+WATER = ["high", "medium", "low", "none", "scarce"]
+
+
+@pytest.fixture(scope="module")
+def catalogue():
+    return synthetic_catalogue(200)
+
+
+def decode(payload: bytes) -> tuple:
+    assert payload[:8] == GRID_MAGIC
+    (size,) = struct.unpack_from("<I", payload, 8)
+    header = json.loads(payload[12:12 + size])
+    start = 12 + size + (-(12 + size) % 8)
+    return header, payload[start:]
+
+
+def assert_matches(catalogue, keys, soil, water, temperatures, rainfalls):
+    header, scores = decode(suitability_grid(keys, soil, water, temperatures, rainfalls, catalogue))
+    assert header["shape"] == [len(keys), len(temperatures), len(rainfalls)]
+    assert header["crops"] == keys and header["catalogue_version"] == catalogue.version
+    assert len(scores) == len(keys) * len(temperatures) * len(rainfalls)
+    soil_key, water_key = normalize_soil(soil), normalize_water(water)
+    expected = bytes(score_crop(catalogue, catalogue.index[key], soil_key, t, r, water_key)
+                     for key in keys for t in temperatures for r in rainfalls)
+    assert scores == expected
+
+
+def test_random_grids_match_score_crop(catalogue):
+    rng = random.Random(1)
+    for _ in range(30):
+        low = rng.uniform(-10, 30)
+        temperatures = grid_axis(low, low + rng.uniform(0, 30), rng.randint(1, 30))
+        low = rng.uniform(0, 1500)
+        rainfalls = grid_axis(low, low + rng.uniform(0, 2500), rng.randint(1, 30))
+        assert_matches(catalogue, rng.sample(catalogue.keys, 20), rng.choice(SOILS), rng.choice(WATER),
+                       temperatures, rainfalls)
+
+
+def test_band_edges_match_score_crop(catalogue):
+    keys = catalogue.keys[:20]
+    edges_t, edges_r = set(), set()
+    for key in keys:
+        i = catalogue.index[key]
+        t_min, t_max = catalogue.temp_min[i], catalogue.temp_max[i]
+        r_min, r_max = catalogue.rain_min[i], catalogue.rain_max[i]
+        edges_t.update((t_min - 5, t_min, t_max, t_max + 5))
+        edges_r.update((r_min * 0.7, r_min, r_max))
+    for soil in ("loamy", "clay"):
+        for water in ("medium", "low"):
+            assert_matches(catalogue, keys, soil, water, sorted(edges_t), sorted(edges_r))
+
+
+def test_single_point_axes(catalogue):
+    assert grid_axis(20, 30, 1) == [20.0]
+    assert_matches(catalogue, catalogue.keys[:5], "loamy", "high", [22.0], [800.0])
+
+
+def test_empty_crop_selection_is_rejected():
+    body = {"soil_type": "loamy", "water_level": "medium",
+            "temperature": {"min": 10, "max": 40, "steps": 4}, "rainfall": {"min": 200, "max": 2000, "steps": 4}}
+    client = TestClient(app)
+    assert client.post("/api/suitability-grid", json={**body, "crops": []}).status_code == 422
+    response = client.post("/api/suitability-grid", json=body)
+    assert response.status_code == 200
+    header, scores = decode(response.content)
+    assert header["shape"][0] == len(header["crops"]) > 0
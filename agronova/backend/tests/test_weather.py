@@ -0,0 +1,72 @@
+"""
+Weather lookups while OpenWeatherMap is unreachable: named and GPS lookups
+both fall back to flagged demo data, and neither puts it in the cache. A
+malformed reply is counted once, as an error.
+"""
+import asyncio
+import socket
+
+import httpx
+import pytest
+
+import http_client
+import weather
+from database import init_db
+from http_client import close_client
+from metrics import UPSTREAM_DURATION
+
+
+@pytest.fixture
+def unreachable(monkeypatch):
+    with socket.socket() as s:  # a port nothing listens on once closed
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    init_db()
+    monkeypatch.setattr(weather, "OPENWEATHER_API_KEY", "test")
+    monkeypatch.setattr(weather, "OPENWEATHER_BASE_URL", f"http://127.0.0.1:{port}")
+    weather._weather_cache.clear()
+    yield
+    weather._weather_cache.clear()
+
+
+def run(coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await close_client()
+    return asyncio.run(main())
+
+
+def test_named_lookup_serves_demo_data_without_caching_it(unreachable):
+    result = run(weather.get_weather_by_location("Nashik"))
+    assert result["success"] and result["demo_mode"]
+    assert weather._weather_cache == {}
+
+
+def test_gps_lookup_serves_demo_data_without_caching_it(unreachable):
+    result = run(weather.get_weather_by_coords(19.99, 73.79))
+    assert result["success"] and result["demo_mode"]
+    assert result["coordinates"] == {"lat": 19.99, "lon": 73.79}
+    assert weather._weather_cache == {}
+
+
+def outcomes() -> dict:
+    return {labels[1]: sum(counts[:-1]) for labels, counts in UPSTREAM_DURATION._merged().items()
+            if labels[0] == "openweathermap"}
+
+
+@pytest.mark.parametrize("lookup", [lambda: weather.fetch_weather_upstream("Nashik"),
+                                    lambda: weather.fetch_weather_by_coords(19.99, 73.79)],
+                         ids=["named", "gps"])
+def test_malformed_reply_is_counted_once_as_error(monkeypatch, lookup):
+    init_db()
+    monkeypatch.setattr(weather, "OPENWEATHER_API_KEY", "test")
+    monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"cod": 200}))))
+    before = outcomes()
+    result = run(lookup())
+    assert not result["success"]
+    after = outcomes()
+    assert after.get("error", 0) - before.get("error", 0) == 1
+    assert after.get("success", 0) == before.get("success", 0)
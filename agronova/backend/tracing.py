@@ -0,0 +1,255 @@
+"""
+Lightweight request tracing.
+
+Spans are kept in a contextvar, so the current trace follows a request
+through awaits, asyncio tasks and the threadpool (anyio copies the context
+into worker threads). A sampling decision is made once per request; when a
+request is not sampled, span() returns a shared no-op object and costs one
+contextvar lookup. With TRACE_SAMPLE_RATE=0 tracing is fully disabled:
+@traced returns the function unwrapped and the middleware is a pass-through.
+
+Finished spans are batched by a background thread and written as OTLP/JSON
+ExportTraceServiceRequest documents, either one per line to TRACE_FILE or
+POSTed to TRACE_OTLP_ENDPOINT (e.g. http://localhost:4318/v1/traces).
+
+Settings (environment):
+    TRACE_SAMPLE_RATE    fraction of requests to trace, 0 (default) disables
+    TRACE_FILE           path of the JSON-lines export file (default traces.jsonl)
+    TRACE_OTLP_ENDPOINT  OTLP/HTTP JSON collector URL; overrides TRACE_FILE
+"""
+import contextvars
+import functools
+import json
+import os
+import queue
+import random
+import threading
+import time
+
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "")
+TRACING_ENABLED = TRACE_SAMPLE_RATE > 0
+SERVICE_NAME = "agronova-api"
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 2.0
+
+_current_span = contextvars.ContextVar("agronova_span", default=None)
+_queue = queue.Queue(maxsize=10000)
+_exporter = None
+
+
+class _NoopSpan:
+    __slots__ = ()
+    sampled = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_attribute(self, key: str, value):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes",
+                 "start_ns", "end_ns", "error", "_token")
+    sampled = True
+
+    def __init__(self, name: str, trace_id: str, parent_id: str = "", attributes: dict = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.attributes = attributes or {}
+        self.error = None
+
+    def __enter__(self):
+        self.start_ns = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.error = repr(exc)
+        try:
+            _queue.put_nowait(self)
+        except queue.Full:
+            pass  # never block a request on the exporter
+        return False
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 0},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def span(name: str, **attributes):
+    """Child span of the current trace, or a no-op when the request isn't sampled"""
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(name, parent.trace_id, parent.span_id, attributes)
+
+
+def start_trace(name: str, traceparent: str = "", **attributes):
+    """
+    Root span for a request. Continues a W3C traceparent if one is given
+    (honouring its sampled flag), otherwise samples at TRACE_SAMPLE_RATE.
+    Only called when TRACING_ENABLED.
+    """
+    parts = traceparent.split("-")
+    if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16 and len(parts[3]) == 2:
+        try:
+            sampled = int(parts[3], 16) & 1
+        except ValueError:
+            sampled = False
+        if not sampled:
+            return NOOP_SPAN
+        _ensure_exporter()
+        return Span(name, parts[1], parts[2], attributes)
+
+    if random.random() >= TRACE_SAMPLE_RATE:
+        return NOOP_SPAN
+    _ensure_exporter()
+    return Span(name, "%032x" % random.getrandbits(128), "", attributes)
+
+
+def traced(name: str):
+    """Decorator form of span() for sync functions"""
+    def decorator(fn):
+        if not TRACING_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ─── EXPORTER ─────────────────────────────────────────────────────────────────
+
+def _export(batch: list):
+    payload = json.dumps({
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "agronova.tracing"},
+                            "spans": [s.to_otlp() for s in batch]}],
+        }]
+    }, ensure_ascii=False)
+
+    if TRACE_OTLP_ENDPOINT:
+        import urllib.request
+        req = urllib.request.Request(TRACE_OTLP_ENDPOINT, data=payload.encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(req, timeout=5).close()
+    else:
+        with open(TRACE_FILE, "a", encoding="utf-8") as f:
+            f.write(payload + "\n")
+
+
+def _run_exporter():
+    while True:
+        batch = [_queue.get()]
+        deadline = time.monotonic() + FLUSH_INTERVAL
+        while len(batch) < BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(_queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        try:
+            _export(batch)
+        except Exception as e:
+            print(f"⚠️ Trace export failed: {e}")
+
+
+def _ensure_exporter():
+    global _exporter
+    if _exporter is None:
+        _exporter = threading.Thread(target=_run_exporter, name="trace-exporter", daemon=True)
+        _exporter.start()
+
+
+def _reset_after_fork():
+    # Threads don't survive fork: a worker gets an empty queue and its own exporter
+    global _queue, _exporter
+    _queue = queue.Queue(maxsize=10000)
+    _exporter = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# ─── MIDDLEWARE ───────────────────────────────────────────────────────────────
+
+class TracingMiddleware:
+    """Opens the root span for each HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = ""
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+
+        root = start_trace(f'{scope["method"]} {scope["path"]}', traceparent,
+                           **{"http.method": scope["method"], "http.target": scope["path"]})
+        if not root.sampled:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+            await send(message)
+
+        with root:
+            await self.app(scope, receive, send_wrapper)
@@ -1,70 +1,395 @@
-import requests
+import asyncio
+import heapq
+import math
 import os
+import time
+import climatology
+import geocoding
+from database import get_weather_snapshots
+from geocoding import NOT_FOUND, normalize_place
+from http_client import get_client
+from metrics import UPSTREAM_DURATION, UPSTREAM_QUOTA_REMAINING, UPSTREAM_QUOTA_DENIED, WEATHER_CACHE, WEATHER_PREFETCH
+from quota import TokenBucket, share
+from tracing import span
 
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
+OPENWEATHER_BASE_URL = os.getenv("OPENWEATHER_BASE_URL", "https://api.openweathermap.org")
 
-def get_weather_by_location(location: str) -> dict:
+# ─── UPSTREAM QUOTA ───────────────────────────────────────────────────────────
+# Every OpenWeatherMap call spends a token (free plan: 60 calls/minute).
+# The plan is split between ingest.py and the API workers (see quota.py);
+# this process's bucket holds one worker's share. Background refreshes keep
+# half the burst in reserve for farmers waiting on a lookup. With no token
+# the lookup is answered from the cache at any age, or from the regional
+# estimate, and nothing is cached.
+OPENWEATHER_CALLS_PER_MINUTE = int(os.getenv("OPENWEATHER_CALLS_PER_MINUTE", "60"))
+OPENWEATHER_INGEST_CALLS_PER_MINUTE = int(os.getenv("OPENWEATHER_INGEST_CALLS_PER_MINUTE",
+                                                    str(OPENWEATHER_CALLS_PER_MINUTE // 2)))
+OPENWEATHER_BURST = int(os.getenv("OPENWEATHER_BURST", "10"))
+OPENWEATHER_QUOTA = TokenBucket(share(OPENWEATHER_CALLS_PER_MINUTE - OPENWEATHER_INGEST_CALLS_PER_MINUTE,
+                                      int(os.getenv("WEB_CONCURRENCY", "1"))), OPENWEATHER_BURST)
+UPSTREAM_QUOTA_REMAINING.set_function("openweathermap", fn=OPENWEATHER_QUOTA.remaining)
+
+QUOTA_EXHAUSTED = {"success": False, "error": "Upstream quota exhausted", "quota_exhausted": True}
+
+def _take_token(background: bool) -> bool:
+    if OPENWEATHER_QUOTA.try_take(background):
+        return True
+    UPSTREAM_QUOTA_DENIED.inc("openweathermap", "background" if background else "interactive")
+    return False
+
+def estimate_weather(location: str) -> dict:
+    """Regional estimate served while the upstream quota is exhausted"""
+    return {**get_demo_weather(location), "estimated": True,
+            "note": "Estimated — live weather is busy, showing regional averages"}
+
+# ─── WEATHER CACHE ────────────────────────────────────────────────────────────
+# Live observations are kept per normalized location so repeat lookups
+# (and /api/onboard after /api/weather) skip the upstream round trip. Demo
+# data (no key, upstream unreachable) and estimates are never cached, so
+# they do not outlive the outage.
+# Stale-while-revalidate: for WEATHER_STALE_TTL after an entry expires it is
+# still served immediately while one background fetch refreshes it. Only a
+# location with no usable entry waits on the upstream, and concurrent
+# lookups for it share a single fetch.
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+WEATHER_STALE_TTL = float(os.getenv("WEATHER_STALE_TTL", "3600"))
+WEATHER_CACHE_SIZE = 1024
+_weather_cache = {}  # normalized location or geocell -> (fresh_until, stale_until, result)
+_inflight = {}       # normalized location or geocell -> task fetching it
+
+def _cache_key(location: str) -> str:
+    return normalize_place(location)
+
+def _store(key: str, result: dict):
+    if key not in _weather_cache and len(_weather_cache) >= WEATHER_CACHE_SIZE:
+        _weather_cache.pop(next(iter(_weather_cache)))
+    now = time.monotonic()
+    _weather_cache[key] = (now + WEATHER_CACHE_TTL, now + WEATHER_CACHE_TTL + WEATHER_STALE_TTL, result)
+
+async def _fetch_and_store(key, location: str, background: bool) -> dict:
+    if isinstance(key, tuple):  # geocell: ask for the cell centre
+        result = await fetch_weather_by_coords(*cell_centre(key), background)
+    else:
+        result = await fetch_weather_upstream(location, background)
+    if result["success"] and not result.get("demo_mode"):
+        _store(key, result)
+    elif result.get("quota_exhausted"):
+        entry = _weather_cache.get(key)  # past its stale deadline, but better than nothing
+        return entry[2] if entry else estimate_weather(location)
+    return result
+
+def _refresh(key, location: str, background: bool = False) -> asyncio.Task:
+    """Start (or join) the single upstream fetch for a location"""
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_and_store(key, location, background))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return task
+
+# ─── DISTRICT SNAPSHOTS ───────────────────────────────────────────────────────
+# ingest.py stores current conditions for every district we serve in the
+# weather_snapshots table. Each worker keeps them in memory, reloading rows
+# written since its last load every WEATHER_SNAPSHOT_RELOAD seconds, and
+# answers lookups for a district name (or alias) from a snapshot younger
+# than WEATHER_SNAPSHOT_MAX_AGE without touching the upstream.
+WEATHER_SNAPSHOT_MAX_AGE = float(os.getenv("WEATHER_SNAPSHOT_MAX_AGE", "10800"))
+WEATHER_SNAPSHOT_RELOAD = float(os.getenv("WEATHER_SNAPSHOT_RELOAD", "300"))
+_snapshots = {}  # normalized district name or alias -> (fetched_at, result)
+_snapshots_loaded_until = 0.0
+
+def load_snapshots() -> int:
+    """Load snapshots written since the last call (blocking: run in a thread)"""
+    global _snapshots_loaded_until
+    rows = get_weather_snapshots(_snapshots_loaded_until)
+    for row in rows:
+        for name in row["names"]:
+            _snapshots[_cache_key(name)] = (row["fetched_at"], row["data"])
+        _snapshots_loaded_until = max(_snapshots_loaded_until, row["fetched_at"])
+    return len(rows)
+
+async def run_snapshot_reloader():
+    """Background loop started by the app lifespan"""
+    while True:
+        try:
+            await asyncio.to_thread(load_snapshots)
+        except Exception as e:
+            print(f"⚠️ Weather snapshot reload failed: {e}")
+        await asyncio.sleep(WEATHER_SNAPSHOT_RELOAD)
+
+async def get_weather_by_location(location: str) -> dict:
+    """
+    Fetch weather for a location: district snapshot, then the cache (fresh
+    or stale), then the upstream.
+    """
+    key = _cache_key(location)
+    snapshot = _snapshots.get(key)
+    if snapshot and time.time() - snapshot[0] < WEATHER_SNAPSHOT_MAX_AGE:
+        WEATHER_CACHE.inc("snapshot")
+        return snapshot[1]
+
+    return await _cached(key, location)
+
+async def _cached(key, location: str) -> dict:
+    """Serve from the weather cache (fresh or stale) or wait on the upstream"""
+    _record_demand(key, location)
+    entry = _weather_cache.get(key)
+    now = time.monotonic()
+    if entry and entry[0] > now:
+        WEATHER_CACHE.inc("fresh")
+        return entry[2]
+    if entry and entry[1] > now:
+        WEATHER_CACHE.inc("stale")
+        _refresh(key, location, background=True)
+        return entry[2]
+
+    WEATHER_CACHE.inc("miss")
+    # shield: a cancelled request must not cancel the fetch other callers share
+    return await asyncio.shield(_refresh(key, location))
+
+# ─── GEOCELLS ─────────────────────────────────────────────────────────────────
+# GPS lookups are snapped to a grid of WEATHER_GEOCELL_DEG degrees (0.1° is
+# about 11 km) and cached per cell. The upstream is asked for the cell
+# centre, so every farmer in a cell shares one observation and one call,
+# and no place name has to be resolved. Rainfall is the cell's learned
+# normal (climatology.py) once it has one, else estimated for the exact
+# point.
+WEATHER_GEOCELL_DEG = float(os.getenv("WEATHER_GEOCELL_DEG", "0.1"))
+
+def geocell(lat: float, lon: float) -> tuple:
+    """Grid cell (row, column) containing a point"""
+    return (math.floor(lat / WEATHER_GEOCELL_DEG), math.floor(lon / WEATHER_GEOCELL_DEG))
+
+def cell_centre(cell: tuple) -> tuple:
+    return (round((cell[0] + 0.5) * WEATHER_GEOCELL_DEG, 6), round((cell[1] + 0.5) * WEATHER_GEOCELL_DEG, 6))
+
+async def get_weather_by_coords(lat: float, lon: float) -> dict:
+    """Weather for a GPS fix, shared by everyone in its geocell"""
+    cell = geocell(lat, lon)
+    centre_lat, centre_lon = cell_centre(cell)
+    result = await _cached(cell, f"{centre_lat}, {centre_lon}")
+    if not result["success"]:
+        return result
+    # A learned normal is for this same cell; otherwise estimate for the exact point
+    rainfall = result["rainfall_annual_mm"] if result.get("rainfall_source") else estimate_annual_rainfall(lat, lon)
+    return {**result,
+            "rainfall_annual_mm": rainfall,
+            "coordinates": {"lat": lat, "lon": lon},
+            "geocell": {"lat": centre_lat, "lon": centre_lon, "size_deg": WEATHER_GEOCELL_DEG}}
+
+# ─── HOT LOCATION PREFETCH ────────────────────────────────────────────────────
+# Demand per location is counted with exponential decay (halved every
+# cycle). Each cycle the hottest cached locations that expire within the
+# next two cycles are refreshed ahead of time, at most
+# WEATHER_PREFETCH_BUDGET upstream calls per cycle, so the morning rush
+# finds them fresh. Runs only with a real API key.
+WEATHER_PREFETCH_INTERVAL = float(os.getenv("WEATHER_PREFETCH_INTERVAL", "60"))
+WEATHER_PREFETCH_BUDGET = int(os.getenv("WEATHER_PREFETCH_BUDGET", "20"))
+PREFETCH_CANDIDATES = 200
+PREFETCH_MIN_DEMAND = 2.0
+DEMAND_MAX_LOCATIONS = 4096
+_demand = {}  # normalized location or geocell -> [decayed request count, location as typed]
+
+def _record_demand(key, location: str):
+    entry = _demand.get(key)
+    if entry is not None:
+        entry[0] += 1
+    elif len(_demand) < DEMAND_MAX_LOCATIONS:
+        _demand[key] = [1.0, location]
+
+async def prefetch_hot_locations() -> int:
+    """One prefetch cycle; returns the number of upstream refreshes made"""
+    now = time.monotonic()
+    lead = 2 * WEATHER_PREFETCH_INTERVAL
+    due = []
+    for key, (demand, location) in heapq.nlargest(PREFETCH_CANDIDATES, _demand.items(), key=lambda kv: kv[1][0]):
+        if len(due) >= WEATHER_PREFETCH_BUDGET or demand < PREFETCH_MIN_DEMAND:
+            break
+        entry = _weather_cache.get(key)
+        if entry and entry[0] - now < lead and key not in _inflight:
+            due.append((key, location))
+
+    await asyncio.gather(*(_refresh(key, location, background=True) for key, location in due))
+    WEATHER_PREFETCH.inc(amount=len(due))
+
+    for key in list(_demand):
+        _demand[key][0] /= 2
+        if _demand[key][0] < 0.1:
+            del _demand[key]
+    return len(due)
+
+async def run_prefetcher():
+    """Background loop started by the app lifespan"""
+    if not OPENWEATHER_API_KEY:
+        return
+    while True:
+        await asyncio.sleep(WEATHER_PREFETCH_INTERVAL)
+        try:
+            await prefetch_hot_locations()
+        except Exception as e:
+            print(f"⚠️ Weather prefetch failed: {e}")
+
+async def fetch_weather_upstream(location: str, background: bool = False) -> dict:
     """
     Fetch real weather data from OpenWeatherMap API.
-    Returns temperature, humidity, rainfall estimate.
+    Returns temperature, humidity, rainfall estimate, or QUOTA_EXHAUSTED
+    when no upstream token is available.
     """
     if not OPENWEATHER_API_KEY:
         # Return demo data if no API key (for testing)
         return get_demo_weather(location)
 
+    # Names resolved before go straight to a coordinate lookup
+    key = normalize_place(location)
+    place = await geocoding.lookup(key)
+    if place is NOT_FOUND:
+        return {"success": False, "error": "Location not found"}
+    if place:
+        result = await fetch_weather_by_coords(place["lat"], place["lon"], background)
+        return {**result, "location": place["name"]} if result["success"] else result
+
+    if not _take_token(background):
+        return QUOTA_EXHAUSTED
+
+    import httpx
+    start = time.perf_counter()
+    def observe(outcome: str):
+        UPSTREAM_DURATION.observe(time.perf_counter() - start, "openweathermap", outcome)
+
     try:
         # Get current weather
-        url = f"https://api.openweathermap.org/data/2.5/weather"
+        url = f"{OPENWEATHER_BASE_URL}/data/2.5/weather"
         params = {
             "q": location + ",IN",  # Prioritize India
             "appid": OPENWEATHER_API_KEY,
             "units": "metric"
         }
-        response = requests.get(url, params=params, timeout=10)
+        client = get_client()
+        with span("openweathermap GET /weather", q=params["q"]) as s:
+            response = await client.get(url, params=params)
+            s.set_attribute("http.status_code", response.status_code)
 
-        if response.status_code == 404:
+        retried = False
+        if response.status_code == 404 and _take_token(background):
             # Try without ,IN suffix
+            retried = True
             params["q"] = location
-            response = requests.get(url, params=params, timeout=10)
+            with span("openweathermap GET /weather", q=params["q"]) as s:
+                response = await client.get(url, params=params)
+                s.set_attribute("http.status_code", response.status_code)
 
         if response.status_code != 200:
+            if response.status_code == 404 and retried:
+                await geocoding.record(key)
+            observe("404" if response.status_code == 404 else "error")
             return {"success": False, "error": "Location not found"}
 
-        data = response.json()
-
-        # Get rainfall from forecast (annual estimate)
-        forecast_url = f"https://api.openweathermap.org/data/2.5/forecast"
-        forecast_resp = requests.get(forecast_url, params=params, timeout=10)
-        
-        # Estimate annual rainfall from current data
-        rain_1h = data.get("rain", {}).get("1h", 0)
-        estimated_annual_rain = rain_1h * 8760  # rough estimate
-        
-        # Better: use known regional averages based on coordinates
-        lat = data["coord"]["lat"]
-        lon = data["coord"]["lon"]
-        estimated_annual_rain = estimate_annual_rainfall(lat, lon)
+        result = await _observe(response.json())
+        await geocoding.record(key, result["location"], result["coordinates"]["lat"],
+                               result["coordinates"]["lon"], result["country"])
+        observe("success")
+        return result
 
-        return {
-            "success": True,
-            "location": data["name"],
-            "country": data["sys"]["country"],
-            "temperature": round(data["main"]["temp"], 1),
-            "humidity": round(data["main"]["humidity"], 1),
-            "description": data["weather"][0]["description"],
-            "rainfall_annual_mm": estimated_annual_rain,
-            "coordinates": {
-                "lat": lat,
-                "lon": lon
-            }
-        }
-
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
+        observe("fallback")
         return get_demo_weather(location)
+    except httpx.TimeoutException as e:
+        observe("timeout")
+        return {"success": False, "error": str(e)}
     except Exception as e:
+        observe("error")
         return {"success": False, "error": str(e)}
 
 
+async def fetch_weather_by_coords(lat: float, lon: float, background: bool = False,
+                                  wait: bool = False) -> dict:
+    """
+    Fetch current weather at a point (one OpenWeatherMap call), or
+    QUOTA_EXHAUSTED when no upstream token is available. Batch jobs pass
+    wait=True to queue for a token instead.
+    """
+    if not OPENWEATHER_API_KEY:
+        return demo_weather_at(lat, lon)
+    if wait:
+        await OPENWEATHER_QUOTA.take(background)
+    elif not _take_token(background):
+        return QUOTA_EXHAUSTED
+
+    import httpx
+    start = time.perf_counter()
+    def observe(outcome: str):
+        UPSTREAM_DURATION.observe(time.perf_counter() - start, "openweathermap", outcome)
+
+    try:
+        params = {"lat": lat, "lon": lon, "appid": OPENWEATHER_API_KEY, "units": "metric"}
+        with span("openweathermap GET /weather", lat=lat, lon=lon) as s:
+            response = await get_client().get(f"{OPENWEATHER_BASE_URL}/data/2.5/weather", params=params)
+            s.set_attribute("http.status_code", response.status_code)
+
+        if response.status_code != 200:
+            observe("error")
+            return {"success": False, "error": f"Upstream returned {response.status_code}"}
+
+        result = await _observe(response.json())
+        observe("success")
+        return result
+
+    except httpx.ConnectError:
+        # Same as a named lookup: demo data, flagged, and never cached
+        observe("fallback")
+        return demo_weather_at(lat, lon)
+    except httpx.TimeoutException as e:
+        observe("timeout")
+        return {"success": False, "error": str(e)}
+    except Exception as e:
+        observe("error")
+        return {"success": False, "error": str(e)}
+
+
+async def _observe(data: dict) -> dict:
+    """
+    Parse an upstream observation and add it to its geocell's climatology;
+    the cell's learned rainfall normal replaces the zone estimate once
+    there is one.
+    """
+    result = _parse_current(data)
+    cell = geocell(result["coordinates"]["lat"], result["coordinates"]["lon"])
+    month = time.gmtime(data.get("dt", time.time())).tm_mon
+    try:
+        normals = await asyncio.to_thread(climatology.observe, cell, data["main"]["temp"],
+                                          data["main"]["humidity"], data.get("rain", {}).get("1h", 0), month)
+    except Exception as e:
+        print(f"⚠️ Climatology update failed: {e}")
+        return result
+    if normals["rainfall_annual_mm"] is not None:
+        result["rainfall_annual_mm"] = normals["rainfall_annual_mm"]
+        result["rainfall_source"] = "local"
+    return result
+
+
+def _parse_current(data: dict) -> dict:
+    """Normalize an OpenWeatherMap current-weather payload"""
+    # Annual rainfall from known regional averages based on coordinates
+    lat = data["coord"]["lat"]
+    lon = data["coord"]["lon"]
+    estimated_annual_rain = estimate_annual_rainfall(lat, lon)
+
+    return {
+        "success": True,
+        "location": data["name"],
+        "country": data["sys"]["country"],
+        "temperature": round(data["main"]["temp"], 1),
+        "humidity": round(data["main"]["humidity"], 1),
+        "description": data["weather"][0]["description"],
+        "rainfall_annual_mm": estimated_annual_rain,
+        "coordinates": {
+            "lat": lat,
+            "lon": lon
+        }
+    }
+
+
 def estimate_annual_rainfall(lat: float, lon: float) -> float:
     """
     Estimate annual rainfall based on India's rainfall zones by coordinates.
@@ -119,6 +444,13 @@ def estimate_annual_rainfall(lat: float, lon: float) -> float:
     return 900
 
 
+def demo_weather_at(lat: float, lon: float) -> dict:
+    """Demo weather for a point, with the zone rainfall estimate"""
+    return {**get_demo_weather(f"{lat:.2f}, {lon:.2f}"),
+            "rainfall_annual_mm": estimate_annual_rainfall(lat, lon),
+            "coordinates": {"lat": lat, "lon": lon}}
+
+
 def get_demo_weather(location: str) -> dict:
     """
     Return demo weather data when no API key is available.